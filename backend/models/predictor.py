@@ -7,19 +7,32 @@ Works with the new SimpleTrainer system.
 import os
 import sys
 import json
+from collections import namedtuple
 import numpy as np
 import pandas as pd
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from sklearn.preprocessing import StandardScaler
-import joblib
 from typing import List, Dict
 import logging
 
+# The lightweight TFLite runtime is enough for prediction; fall back to the
+# interpreter bundled with TensorFlow when it isn't installed (that import loads
+# all of TensorFlow, so the faster startup needs the optional tflite-runtime)
+try:
+    from tflite_runtime.interpreter import Interpreter, load_delegate
+except ImportError:
+    from tensorflow.lite.python.interpreter import Interpreter, load_delegate
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Configuration
+SEQUENCE_LENGTH = 10
+CHUNK_SIZE = 16384  # Rows read per chunk when streaming a CSV
+XNNPACK_DELEGATE = 'libtensorflowlite_xnnpack_delegate.so'
+
+# Fitted StandardScaler parameters; transform is (X - mean) / scale
+Scaler = namedtuple('Scaler', ['mean', 'scale'])
+
 class SimplePredictor:
     """Simple predictor for trained models."""
     
@@ -28,7 +41,10 @@ class SimplePredictor:
         self.machine_id = machine_id
         self.model_dir = self._get_model_directory()
         self.model = None
+        self.interpreter = None
         self.scaler = None
+        self._scale_a = None
+        self._scale_b = None
         self.threshold = None
         self.sensor_columns = None
         
@@ -45,35 +61,37 @@ class SimplePredictor:
                 logger.error(f"Model directory not found: {self.model_dir}")
                 return False
             
-            # Load model
+            # Load model, preferring the TFLite export over the Keras model
+            tflite_path = os.path.join(self.model_dir, 'model.tflite')
             model_path = os.path.join(self.model_dir, 'model.h5')
-            if not os.path.exists(model_path):
+            if self._is_current(tflite_path, model_path):
+                self.interpreter = self._create_interpreter(tflite_path)
+                logger.info(f"Loaded TFLite model from {tflite_path}")
+            elif os.path.exists(model_path):
+                # Models without a TFLite export still need full TensorFlow
+                from tensorflow.keras.models import load_model as load_keras_model
+                self.model = load_keras_model(model_path)
+                logger.info(f"Loaded model from {model_path}")
+            else:
                 logger.error(f"Model file not found: {model_path}")
                 return False
             
-            self.model = load_model(model_path)
-            logger.info(f"Loaded model from {model_path}")
-            
-            # Load scaler
-            scaler_path = os.path.join(self.model_dir, 'scaler.pkl')
-            if os.path.exists(scaler_path):
-                self.scaler = joblib.load(scaler_path)
-                logger.info(f"Loaded scaler from {scaler_path}")
-            
-            # Load columns
-            columns_path = os.path.join(self.model_dir, 'columns.json')
-            if os.path.exists(columns_path):
-                with open(columns_path, 'r') as f:
-                    self.sensor_columns = json.load(f)
-                logger.info(f"Loaded sensor columns: {self.sensor_columns}")
-            
-            # Load threshold
-            stats_path = os.path.join(self.model_dir, 'training_stats.json')
-            if os.path.exists(stats_path):
-                with open(stats_path, 'r') as f:
-                    stats = json.load(f)
-                self.threshold = stats.get('threshold', 0.1)
-                logger.info(f"Loaded threshold: {self.threshold}")
+            # Load scaler, columns and threshold from the single metadata
+            # bundle, falling back to the individual files of older models
+            meta_path = os.path.join(self.model_dir, 'meta.npz')
+            if self._is_current(meta_path, model_path):
+                with np.load(meta_path) as meta:
+                    self.scaler = Scaler(meta['mean'].astype(np.float32), meta['scale'].astype(np.float32))
+                    self.sensor_columns = tuple(meta['columns'].tolist())
+                    self.threshold = float(meta['threshold'])
+                logger.info(f"Loaded metadata from {meta_path}")
+            else:
+                self._load_legacy_metadata()
+            
+            # Fold the scaler into a single affine map: (x - mean) / scale == x * a + b
+            if self.scaler:
+                self._scale_a = np.reciprocal(self.scaler.scale)
+                self._scale_b = -self.scaler.mean * self._scale_a
             
             return True
             
@@ -81,11 +99,98 @@ class SimplePredictor:
             logger.error(f"Error loading model: {str(e)}")
             return False
     
+    @staticmethod
+    def _available_cpus() -> int:
+        """CPUs this process may run on, so containers with a CPU limit aren't oversubscribed."""
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+    
+    @staticmethod
+    def _is_current(path: str, model_path: str) -> bool:
+        """Whether a trainer.py fast-path artifact exists and is not older than model.h5.
+
+        simple_trainer.py writes only model.h5 and the separate metadata files into
+        the same directory, so a retrain there leaves older exports behind.
+        """
+        if not os.path.exists(path):
+            return False
+        if not os.path.exists(model_path):
+            return True
+        if os.path.getmtime(path) >= os.path.getmtime(model_path):
+            return True
+        logger.warning(f"Ignoring {path}: older than {model_path}")
+        return False
+    
+    def _load_legacy_metadata(self):
+        """Load scaler, columns and threshold from their separate files."""
+        # Load scaler
+        scaler_path = os.path.join(self.model_dir, 'scaler.pkl')
+        if os.path.exists(scaler_path):
+            # Only pickled scalers need joblib (and sklearn to unpickle them)
+            import joblib
+            scaler = joblib.load(scaler_path)
+            self.scaler = Scaler(scaler.mean_.astype(np.float32), scaler.scale_.astype(np.float32))
+            logger.info(f"Loaded scaler from {scaler_path}")
+        
+        # Load columns
+        columns_path = os.path.join(self.model_dir, 'columns.json')
+        if os.path.exists(columns_path):
+            with open(columns_path, 'r') as f:
+                self.sensor_columns = tuple(json.load(f))
+            logger.info(f"Loaded sensor columns: {self.sensor_columns}")
+        
+        # Load threshold
+        stats_path = os.path.join(self.model_dir, 'training_stats.json')
+        if os.path.exists(stats_path):
+            with open(stats_path, 'r') as f:
+                stats = json.load(f)
+            self.threshold = stats.get('threshold', 0.1)
+            logger.info(f"Loaded threshold: {self.threshold}")
+    
+    def _create_interpreter(self, tflite_path: str) -> Interpreter:
+        """Create a TFLite interpreter, using the XNNPACK delegate when it can be loaded."""
+        delegates = []
+        try:
+            delegates.append(load_delegate(XNNPACK_DELEGATE))
+        except (ValueError, OSError):
+            # Stock TensorFlow builds already apply XNNPACK to float models
+            pass
+        
+        # Passing model_path (not model_content) lets TFLite mmap the flatbuffer
+        # read-only, so weights are paged in on demand and shared between
+        # predictor processes instead of being copied into each one
+        interpreter = Interpreter(
+            model_path=tflite_path,
+            experimental_delegates=delegates or None,
+            num_threads=self._available_cpus()
+        )
+        interpreter.allocate_tensors()
+        return interpreter
+    
+    def _run_model(self, sequences: np.ndarray) -> np.ndarray:
+        """Run the autoencoder on a batch of sequences."""
+        if self.interpreter is None:
+            return self.model.predict(sequences, verbose=0)
+        
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        
+        # Only resize when the batch shape changes between calls
+        if tuple(input_details['shape']) != sequences.shape:
+            self.interpreter.resize_input_tensor(input_details['index'], sequences.shape)
+            self.interpreter.allocate_tensors()
+        
+        self.interpreter.set_tensor(input_details['index'], sequences.astype(np.float32, copy=False))
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(output_details['index'])
+    
     def preprocess_data(self, data: pd.DataFrame) -> np.ndarray:
         """Preprocess input data for prediction."""
         try:
             # Select only the sensor columns that exist in the data
-            available_columns = [col for col in self.sensor_columns if col in data.columns]
+            data_columns = set(data.columns)
+            available_columns = [col for col in self.sensor_columns if col in data_columns]
             if not available_columns:
                 raise ValueError(f"No sensor columns found in data. Available: {list(data.columns)}")
             
@@ -93,15 +198,17 @@ class SimplePredictor:
             df_sensors = data[available_columns].copy()
             
             # Handle missing values
-            df_sensors = df_sensors.fillna(method='ffill').fillna(method='bfill')
+            df_sensors = df_sensors.ffill().bfill()
             if df_sensors.empty:
                 raise ValueError("No data remaining after handling missing values")
             
             # Scale the data
             if self.scaler:
-                scaled_data = self.scaler.transform(df_sensors)
+                scaled_data = df_sensors.to_numpy(dtype=np.float32, copy=True)
+                np.multiply(scaled_data, self._scale_a, out=scaled_data)
+                np.add(scaled_data, self._scale_b, out=scaled_data)
             else:
-                scaled_data = df_sensors.values
+                scaled_data = df_sensors.to_numpy(dtype=np.float32)
             
             return scaled_data
             
@@ -109,7 +216,7 @@ class SimplePredictor:
             logger.error(f"Error preprocessing data: {str(e)}")
             raise
     
-    def create_sequences(self, data: np.ndarray, sequence_length: int = 10) -> np.ndarray:
+    def create_sequences(self, data: np.ndarray, sequence_length: int = SEQUENCE_LENGTH) -> np.ndarray:
         """Create sequences for prediction."""
         if len(data) < sequence_length:
             # Pad with the last value if not enough data
@@ -121,11 +228,57 @@ class SimplePredictor:
             sequences.append(data[i:i + sequence_length])
         
         return np.array(sequences)
-    
+
+    @staticmethod
+    def _summarize_errors(mse_errors: np.ndarray, anomalies: np.ndarray) -> Dict:
+        """Compute the summary statistics of the reconstruction errors."""
+        # Four reductions: count, sum, max and min. The rate and mean are
+        # derived from the count and sum rather than reduced separately
+        total = len(mse_errors)
+        num_anomalies = int(np.count_nonzero(anomalies))
+        error_sum = float(mse_errors.sum())
+
+        return {
+            'num_anomalies': num_anomalies,
+            'total_predictions': total,
+            'anomaly_rate': num_anomalies / total,
+            'mean_error': error_sum / total,
+            'max_error': float(mse_errors.max()),
+            'min_error': float(mse_errors.min())
+        }
+
+    def _build_results(self, predictions: np.ndarray, mse_errors: np.ndarray) -> Dict:
+        """Turn predictions and reconstruction errors into the results payload."""
+        # Determine anomalies
+        anomalies = np.empty(mse_errors.shape, dtype=bool)
+        np.greater(mse_errors, self.threshold, out=anomalies)
+        
+        # Calculate risk scores (normalized error), capped in place. Errors
+        # are never negative, so only the upper bound needs clipping.
+        risk_scores = np.empty_like(mse_errors)
+        np.divide(mse_errors, self.threshold, out=risk_scores)
+        np.minimum(risk_scores, 10.0, out=risk_scores)
+
+        # Summary statistics
+        error_stats = self._summarize_errors(mse_errors, anomalies)
+
+        # Prepare results
+        results = {
+            'predictions': predictions.tolist(),
+            'errors': mse_errors.tolist(),
+            'anomalies': anomalies.tolist(),
+            'risk_scores': risk_scores.tolist(),
+            'threshold': self.threshold,
+            **error_stats
+        }
+        
+        logger.info(f"Prediction completed: {results['num_anomalies']} anomalies found")
+        return results
+
     def predict(self, data: pd.DataFrame) -> Dict:
         """Make predictions on the input data."""
         try:
-            if self.model is None:
+            if self.model is None and self.interpreter is None:
                 if not self.load_model():
                     raise ValueError("Failed to load model")
             
@@ -139,34 +292,97 @@ class SimplePredictor:
                 raise ValueError("No sequences created from input data")
             
             # Make predictions
-            predictions = self.model.predict(sequences, verbose=0)
+            predictions = self._run_model(sequences)
             
             # Calculate reconstruction errors
             mse_errors = np.mean((sequences - predictions) ** 2, axis=(1, 2))
             
-            # Determine anomalies
-            anomalies = mse_errors > self.threshold
-            
-            # Calculate risk scores (normalized error)
-            risk_scores = np.clip(mse_errors / self.threshold, 0, 10)
-            
-            # Prepare results
-            results = {
-                'predictions': predictions.tolist(),
-                'errors': mse_errors.tolist(),
-                'anomalies': anomalies.tolist(),
-                'risk_scores': risk_scores.tolist(),
-                'threshold': self.threshold,
-                'num_anomalies': int(np.sum(anomalies)),
-                'total_predictions': len(mse_errors),
-                'anomaly_rate': float(np.mean(anomalies)),
-                'mean_error': float(np.mean(mse_errors)),
-                'max_error': float(np.max(mse_errors)),
-                'min_error': float(np.min(mse_errors))
-            }
-            
-            logger.info(f"Prediction completed: {results['num_anomalies']} anomalies found")
-            return results
+            return self._build_results(predictions, mse_errors)
+            
+        except Exception as e:
+            logger.error(f"Prediction failed: {str(e)}")
+            raise
+
+    def _first_valid_values(self, csv_path: str, chunksize: int) -> pd.Series:
+        """First non-missing value of each sensor column, reading only as far as needed.
+
+        A column with no value anywhere makes this read the whole file, but only
+        one chunk is held at a time.
+        """
+        first_valid = None
+        with pd.read_csv(csv_path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                if first_valid is None:
+                    chunk_columns = set(chunk.columns)
+                    sensors = [col for col in self.sensor_columns if col in chunk_columns]
+                    first_valid = pd.Series(np.nan, index=sensors)
+                first_valid = first_valid.fillna(chunk[sensors].bfill().iloc[0])
+                if first_valid.notna().all():
+                    break
+        return first_valid
+    
+    def _filled_chunks(self, reader, first_valid: pd.Series):
+        """Yield sensor-column chunks filled exactly as ffill().bfill() over the whole file.
+
+        Each chunk's forward fill continues from the previous chunk's last row; the
+        only gaps left after that are the leading ones, which the whole-file bfill
+        would fill with each column's first valid value.
+        """
+        last_row = None
+        for chunk in reader:
+            chunk = chunk[first_valid.index]
+            if last_row is not None:
+                chunk = pd.concat([last_row, chunk], ignore_index=True).ffill().iloc[1:]
+            else:
+                chunk = chunk.ffill()
+            chunk = chunk.fillna(first_valid)
+            last_row = chunk.iloc[-1:]
+            yield chunk
+    
+    def predict_csv(self, csv_path: str, chunksize: int = CHUNK_SIZE) -> Dict:
+        """Make predictions on a CSV file, parsing and preprocessing it in chunks.
+
+        Only one chunk of the CSV is parsed, filled and windowed at a time, but the
+        returned predictions and errors still grow with the file. The last
+        SEQUENCE_LENGTH - 1 rows of each chunk are carried into the next one so
+        sequences spanning a chunk boundary are still produced exactly once;
+        chunksize must therefore be at least SEQUENCE_LENGTH.
+        """
+        try:
+            if chunksize < SEQUENCE_LENGTH:
+                raise ValueError(f"chunksize must be at least {SEQUENCE_LENGTH}, got {chunksize}")
+            
+            if self.model is None and self.interpreter is None:
+                if not self.load_model():
+                    raise ValueError("Failed to load model")
+            
+            predictions = []
+            mse_errors = []
+            tail = None
+            total_rows = 0
+            
+            first_valid = self._first_valid_values(csv_path, chunksize)
+            for chunk in self._filled_chunks(pd.read_csv(csv_path, chunksize=chunksize), first_valid):
+                total_rows += len(chunk)
+                if tail is not None:
+                    chunk = pd.concat([tail, chunk], ignore_index=True)
+                tail = chunk.iloc[-(SEQUENCE_LENGTH - 1):]
+                
+                # Preprocess, window and predict this chunk only
+                scaled_data = self.preprocess_data(chunk)
+                sequences = self.create_sequences(scaled_data)
+                if len(sequences) == 0:
+                    continue
+                
+                chunk_predictions = self._run_model(sequences)
+                predictions.append(chunk_predictions)
+                mse_errors.append(np.mean((sequences - chunk_predictions) ** 2, axis=(1, 2)))
+            
+            if not predictions:
+                raise ValueError("No sequences created from input data")
+            
+            logger.info(f"Streamed CSV with {total_rows} rows in chunks of {chunksize}")
+            return self._build_results(np.concatenate(predictions), np.concatenate(mse_errors))
             
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
@@ -186,15 +402,11 @@ def main():
     csv_path = sys.argv[3]
     
     try:
-        # Load data
-        df = pd.read_csv(csv_path)
-        logger.info(f"Loaded CSV with {len(df)} rows")
-        
         # Create predictor
         predictor = SimplePredictor(user_id, machine_id)
         
-        # Make prediction
-        results = predictor.predict(df)
+        # Make prediction, streaming the CSV in chunks
+        results = predictor.predict_csv(csv_path)
         
         # Send results
         output = {
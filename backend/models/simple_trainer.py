@@ -6,32 +6,276 @@ This is a completely new approach that's easy to debug and reliable.
 
 import os
 import sys
+import csv
+import re
 import json
 import logging
 import gc
+import time
+import threading
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
-import pandas as pd
-import joblib
-from typing import List, Dict, Tuple
-from sklearn.preprocessing import StandardScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense, Dropout
-import tensorflow as tf
+from typing import List, Dict, Tuple, TYPE_CHECKING
+
+# TensorFlow, scikit-learn, joblib, pandas, pyarrow and orjson are imported on first
+# use (see _import_tensorflow) so argument checks in main() fail fast without their
+# startup cost
+if TYPE_CHECKING:
+    import tensorflow as tf
+    from sklearn.preprocessing import StandardScaler
+    from tensorflow.keras.models import Sequential
+
+@lru_cache(maxsize=None)
+def _import_pyarrow():
+    """Return (pyarrow, pyarrow.compute, pyarrow.csv), or None to read CSVs with pandas."""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pv
+    except ImportError:
+        return None
+    return pa, pc, pv
+
+@lru_cache(maxsize=None)
+def _import_orjson():
+    """Return orjson, or None to fall back to the stdlib encoder."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+# orjson serializes the progress stream and metadata files in C
+def _dumps(obj) -> bytes:
+    orjson = _import_orjson()
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+def _dumps_indented(obj) -> bytes:
+    orjson = _import_orjson()
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+class _StdoutWriter:
+    """The only writer to stdout: log lines and tagged JSON lines for Node share
+    one queue, one background thread and one buffered file, so they arrive in
+    the order they were produced and never interleave mid-line."""
+    
+    def __init__(self):
+        # Node starts us with PYTHONUNBUFFERED=1, which makes sys.stdout.buffer a
+        # raw file; write through our own buffered file on the same fd so a
+        # burst of lines costs one write syscall instead of one per line
+        self._out = open(sys.stdout.fileno(), 'wb', buffering=64 * 1024, closefd=False)
+        self._queue = deque()
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._last_flush = 0.0
+        self._thread = threading.Thread(target=self._drain, name='stdout-writer', daemon=True)
+        self._thread.start()
+    
+    def write(self, data: bytes, flush: bool = False):
+        """Queue raw bytes (one or more complete lines)."""
+        self._put((data, None, flush))
+    
+    def write_json(self, tag: bytes, payload: Dict, flush: bool = False):
+        """Queue a TAG:{json} line; the payload is serialized on the writer thread."""
+        self._put((tag, payload, flush))
+    
+    def _put(self, item):
+        with self._lock:
+            if not self._closed:
+                self._queue.append(item)
+                self._event.set()
+                return
+        # After close(), write synchronously once the queue has been written out
+        self._thread.join()
+        with self._lock:
+            self._out.write(self._encode(item))
+            self._out.flush()
+    
+    @staticmethod
+    def _encode(item) -> bytes:
+        data, payload, _ = item
+        if payload is None:
+            return data
+        return data + b':' + _dumps(payload) + b'\n'
+    
+    def _drain(self):
+        while True:
+            self._event.wait()
+            self._event.clear()
+            while self._queue:
+                item = self._queue.popleft()
+                if item is None:
+                    self._out.flush()
+                    return
+                
+                # Keep stray prints from libraries ahead of what was queued after them
+                sys.stdout.flush()
+                self._out.write(self._encode(item))
+                
+                # Within a burst, flush at most every 50ms unless the caller needs
+                # the line delivered now
+                now = time.monotonic()
+                if item[2] or now - self._last_flush > 0.05:
+                    self._out.flush()
+                    self._last_flush = now
+            
+            # The queue is drained; don't leave the tail of a burst in the buffer
+            self._out.flush()
+            self._last_flush = time.monotonic()
+    
+    def close(self):
+        """Write out everything queued and stop the thread; later writes go straight out."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.append(None)
+            self._event.set()
+        # No timeout: _exit() follows with os._exit, which would drop any
+        # lines still queued
+        self._thread.join()
+
+_stdout = _StdoutWriter()
+
+class _StdoutLogHandler(logging.Handler):
+    """Send formatted log records through the shared stdout writer."""
+    
+    def emit(self, record):
+        try:
+            _stdout.write((self.format(record) + '\n').encode('utf-8'))
+        except Exception:
+            self.handleError(record)
 
 # Set up comprehensive logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.StreamHandler(sys.stdout),
+        _StdoutLogHandler(),
         logging.FileHandler('training.log', mode='a')
     ]
 )
 logger = logging.getLogger(__name__)
 
-# Suppress TensorFlow warnings but keep important ones
-tf.get_logger().setLevel(logging.ERROR)
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+def _select_precision_policy(tf) -> str:
+    """Pick a mixed-precision policy the hardware can actually speed up."""
+    if tf.config.list_physical_devices('GPU'):
+        return 'mixed_float16'
+    
+    # bfloat16 only pays off on CPUs with native BF16 (AVX-512 BF16 / AMX)
+    # when TensorFlow's oneDNN kernels are enabled
+    if os.environ.get('TF_ENABLE_ONEDNN_OPTS', '1') != '0':
+        try:
+            with open('/proc/cpuinfo') as f:
+                cpu_flags = f.read()
+        except OSError:
+            cpu_flags = ''
+        if 'avx512_bf16' in cpu_flags or 'amx_bf16' in cpu_flags:
+            return 'mixed_bfloat16'
+    return 'float32'
+
+@lru_cache(maxsize=None)
+def _import_tensorflow():
+    """Import and configure TensorFlow once; methods that need it call this."""
+    # Suppress TensorFlow warnings but keep important ones
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    
+    # A 16-unit dense model gains nothing from wide thread pools; keep them
+    # small and use oneDNN's matmul kernels. Env vars must be set pre-import
+    cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+    intra_op_threads = min(4, cpu_count)
+    os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '1')
+    os.environ.setdefault('TF_NUM_INTRAOP_THREADS', str(intra_op_threads))
+    os.environ.setdefault('TF_NUM_INTEROP_THREADS', '2')
+    # oneDNN's OpenMP pool otherwise spins up one thread per core
+    os.environ.setdefault('OMP_NUM_THREADS', str(intra_op_threads))
+    
+    import tensorflow as tf
+    tf.get_logger().setLevel(logging.ERROR)
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(2)
+    except RuntimeError as e:
+        # Thread pools can't be changed once the runtime is initialized
+        logger.debug(f"⚠️ Could not configure TensorFlow threads: {e}")
+    
+    # The whole pipeline runs in float32, the autoencoder's native precision,
+    # with mixed precision layered on top where the hardware supports it
+    tf.keras.backend.set_floatx('float32')
+    tf.keras.mixed_precision.set_global_policy(_select_precision_policy(tf))
+    return tf
+
+# The pretrained artifacts are shared by every trainer in the process, so
+# each one is read from disk once per path
+@lru_cache(maxsize=8)
+def _read_pretrained_config(config_path: str) -> Dict:
+    with open(config_path, 'r') as f:
+        return json.load(f).get('pretrained_model', {})
+
+@lru_cache(maxsize=8)
+def _read_pretrained_scaler(scaler_path: str) -> 'StandardScaler':
+    import joblib
+    return joblib.load(scaler_path)
+
+@lru_cache(maxsize=8)
+def _read_pretrained_input_dim(model_path: str):
+    """Read the model's input width from the HDF5 config without building the model; None if unknown."""
+    import h5py
+    with h5py.File(model_path, 'r') as f:
+        model_config = f.attrs.get('model_config')
+    if model_config is None:
+        return None
+    if isinstance(model_config, bytes):
+        model_config = model_config.decode('utf-8')
+    
+    # Walk to the first declared input shape (key name differs across Keras versions)
+    pending = [json.loads(model_config)]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, dict):
+            shape = node.get('batch_input_shape') or node.get('batch_shape')
+            if shape:
+                return shape[-1]
+            pending.extend(node.values())
+        elif isinstance(node, list):
+            pending.extend(node)
+    return None
+
+@lru_cache(maxsize=8)
+def _read_pretrained_model(model_path: str) -> Tuple[str, Tuple[np.ndarray, ...]]:
+    """Return the architecture and float32 weights; trainers build their own model from them."""
+    tf = _import_tensorflow()
+    model = tf.keras.models.load_model(model_path, compile=False)
+    return model.to_json(), tuple(w.astype(np.float32) for w in model.get_weights())
+
+# Datasets with 2 to PCA_MAX_FEATURES sensors and no matching pretrained model get a
+# closed-form PCA (linear) autoencoder in place of the trained Dense one. A single
+# sensor keeps the Dense model: one component would reconstruct it exactly and
+# collapse the threshold to zero. The result's training_algorithm and
+# model_architecture say which model was built
+PCA_MIN_FEATURES = 2
+PCA_MAX_FEATURES = 32
+VALIDATION_SPLIT = 0.2
+
+# Column names containing any of these (case-insensitive) are metadata, not sensors
+METADATA_COLUMN_PATTERN = re.compile('time|timestamp|date|id|asset|train|test|status', re.IGNORECASE)
+
+# Files written to the model directory by save_model
+ARTIFACT_FILES = {
+    'model': 'model.h5',
+    'scaler': 'scaler.pkl',
+    'columns': 'columns.json',
+    'threshold': 'threshold.json',
+    'stats': 'training_stats.json'
+}
 
 class UltraSimpleTrainer:
     """Ultra-simple autoencoder trainer for anomaly detection with comprehensive logging."""
@@ -41,41 +285,54 @@ class UltraSimpleTrainer:
         self.machine_id = machine_id
         self.model = None
         self.scaler = None
+        
+        # Detailed messages are sent together once per phase (see _flush_messages)
+        self._message_buffer = []
+        
         self.model_dir = self._create_model_directory()
         self.pretrained_config = self._load_pretrained_config()
         
         logger.info(f"🚀 Initialized UltraSimpleTrainer for user {user_id}, machine {machine_id}")
         logger.info(f"📁 Model directory: {self.model_dir}")
         
+        # System diagnostics import TensorFlow and psutil, so only gather them when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_system_info()
+        
+        # Log pretrained model info
+        if self.pretrained_config:
+            logger.info(f"🎯 Pretrained model loaded with {len(self.pretrained_config.get('trained_columns', []))} sensors")
+            logger.info(f"🎯 Pretrained threshold: {self.pretrained_config.get('threshold', 'N/A')}")
+        else:
+            logger.info("⚠️ No pretrained model found, will train from scratch")
+    
+    def _log_system_info(self):
+        """Log interpreter, library, memory and device details."""
+        import psutil
+        import pandas as pd
+        tf = _import_tensorflow()
+        
         # Log system info
-        logger.info(f"💻 Python version: {sys.version}")
-        logger.info(f"🧠 TensorFlow version: {tf.__version__}")
-        logger.info(f"📊 NumPy version: {np.__version__}")
-        logger.info(f"🐼 Pandas version: {pd.__version__}")
+        logger.debug(f"💻 Python version: {sys.version}")
+        logger.debug(f"🧠 TensorFlow version: {tf.__version__}")
+        logger.debug(f"📊 NumPy version: {np.__version__}")
+        logger.debug(f"🐼 Pandas version: {pd.__version__}")
         
         # Log memory usage
-        import psutil
         memory = psutil.virtual_memory()
-        logger.info(f"💾 System memory: {memory.total // (1024**3)}GB total, {memory.available // (1024**3)}GB available")
+        logger.debug(f"💾 System memory: {memory.total // (1024**3)}GB total, {memory.available // (1024**3)}GB available")
         
         # Log CPU info
-        logger.info(f"🖥️ CPU cores: {psutil.cpu_count()}")
+        logger.debug(f"🖥️ CPU cores: {psutil.cpu_count()}")
         
         # Check for GPU
         gpus = tf.config.list_physical_devices('GPU')
         if gpus:
-            logger.info(f"🎮 GPU detected: {len(gpus)} device(s)")
+            logger.debug(f"🎮 GPU detected: {len(gpus)} device(s)")
             for i, gpu in enumerate(gpus):
-                logger.info(f"   GPU {i}: {gpu.name}")
+                logger.debug(f"   GPU {i}: {gpu.name}")
         else:
-            logger.info("🖥️ No GPU detected, using CPU")
-        
-        # Log pretrained model info
-        if self.pretrained_config:
-            logger.info(f"🎯 Pretrained model loaded with {len(self.pretrained_config.get('trained_columns', []))} sensors")
-            logger.info(f"🎯 Pretrained threshold: {self.pretrained_config.get('threshold', 'N/A')}")
-        else:
-            logger.info("⚠️ No pretrained model found, will train from scratch")
+            logger.debug("🖥️ No GPU detected, using CPU")
     
     def _create_model_directory(self) -> str:
         """Create model directory with logging, using a configurable base path."""
@@ -105,6 +362,14 @@ class UltraSimpleTrainer:
             logger.error(f"❌ Error creating model directory: {e}")
             raise
     
+    def _emit(self, tag: bytes, payload: Dict, flush: bool = False):
+        """Queue one tagged JSON line for the Node.js parent; the stdout writer thread writes it."""
+        _stdout.write_json(tag, payload, flush)
+    
+    def close(self):
+        """Queue any buffered detailed messages."""
+        self._flush_messages()
+    
     def _send_progress(self, progress: int, message: str):
         """Send progress update with logging."""
         progress_data = {
@@ -112,17 +377,18 @@ class UltraSimpleTrainer:
             "progress": progress,
             "message": message
         }
-        print(f"PROGRESS:{json.dumps(progress_data)}")
+        self._emit(b'PROGRESS', progress_data)
         logger.info(f"📈 Progress {progress}%: {message}")
     
     def _send_detailed_message(self, message: str, message_type: str = "info"):
-        """Send detailed message with logging."""
-        detailed_data = {
+        """Buffer a detailed message for the current phase, with logging; errors go out immediately."""
+        self._message_buffer.append({
             "type": "message",
             "message": message,
             "message_type": message_type
-        }
-        print(f"DETAILED:{json.dumps(detailed_data)}")
+        })
+        if message_type == "error":
+            self._flush_messages()
         
         # Map message types to log levels
         log_level = {
@@ -134,14 +400,21 @@ class UltraSimpleTrainer:
         
         logger.log(log_level, f"[{message_type.upper()}] {message}")
     
+    def _flush_messages(self):
+        """Send the buffered detailed messages, one DETAILED line each, in a single burst."""
+        if not self._message_buffer:
+            return
+        messages, self._message_buffer = self._message_buffer, []
+        for message in messages:
+            self._emit(b'DETAILED', message)
+    
     def _send_heartbeat(self):
         """Send heartbeat to keep connection alive with logging."""
         heartbeat_data = {
             "type": "heartbeat",
-            "timestamp": pd.Timestamp.now().isoformat()
+            "timestamp": datetime.now().isoformat()
         }
-        print(f"HEARTBEAT:{json.dumps(heartbeat_data)}")
-        logger.debug("💓 Heartbeat sent")
+        self._emit(b'HEARTBEAT', heartbeat_data, flush=True)
     
     def _cleanup_memory(self):
         """Clean up memory with logging."""
@@ -151,22 +424,33 @@ class UltraSimpleTrainer:
             logger.debug(f"🧹 Garbage collection: {collected} objects collected")
             
             # Log memory usage after cleanup
-            import psutil
-            process = psutil.Process()
-            memory_info = process.memory_info()
-            memory_mb = memory_info.rss / 1024 / 1024
-            logger.debug(f"💾 Memory usage after cleanup: {memory_mb:.1f}MB")
+            if logger.isEnabledFor(logging.DEBUG):
+                import psutil
+                memory_mb = psutil.Process().memory_info().rss / 1024 / 1024
+                logger.debug(f"💾 Memory usage after cleanup: {memory_mb:.1f}MB")
             
         except Exception as e:
             logger.warning(f"⚠️ Error during memory cleanup: {e}")
     
+    def _release_model(self):
+        """Drop the saved model, then collect garbage and reset Keras' global state."""
+        self.model = None
+        self._cleanup_memory()
+        _import_tensorflow().keras.backend.clear_session()
+    
     def load_and_preprocess_data(self, csv_path: str, sensor_columns: List[str]) -> Tuple[np.ndarray, List[str]]:
         """Load and preprocess CSV data with aggressive memory optimization and comprehensive logging."""
+        import pandas as pd
+        # PyArrow's multithreaded CSV reader is used when installed, pandas otherwise
+        arrow = _import_pyarrow()
+        if arrow is not None:
+            pa, pc, pv = arrow
+        
         self._send_progress(1, "Starting data preprocessing...")
         self._send_detailed_message("Initializing ultra-fast data preprocessing...", "info")
         
-        start_time = pd.Timestamp.now()
-        logger.info(f"🔄 Starting data preprocessing at {start_time}")
+        start_time = time.monotonic()
+        logger.info(f"🔄 Starting data preprocessing at {datetime.now()}")
         logger.info(f"📁 CSV path: {csv_path}")
         logger.info(f"🎯 Requested sensor columns: {sensor_columns}")
         
@@ -186,29 +470,39 @@ class UltraSimpleTrainer:
             
             # First, detect the delimiter by reading a small sample
             try:
-                with open(csv_path, 'r') as f:
-                    first_line = f.readline().strip()
+                with open(csv_path, 'rb') as f:
+                    sample = f.read(4096)
+                first_line = sample.split(b'\n', 1)[0].decode('utf-8', 'replace').strip()
                 logger.info(f"📖 First line preview: {first_line[:100]}...")
                 self._send_detailed_message(f"Read first line: {first_line[:100]}...", "info")
             except Exception as e:
                 logger.error(f"❌ Error reading file: {e}")
                 raise Exception(f"Error reading file: {str(e)}")
             
-            # Detect delimiter (comma or semicolon)
-            comma_count = first_line.count(',')
-            semicolon_count = first_line.count(';')
-            delimiter = ';' if semicolon_count > comma_count else ','
+            # Detect delimiter; plain comma files skip the sniffer entirely
+            delimiter = self._detect_delimiter(sample)
             
-            logger.info(f"🔍 Detected delimiter: '{delimiter}' (commas: {comma_count}, semicolons: {semicolon_count})")
+            logger.info(f"🔍 Detected delimiter: '{delimiter}'")
             self._send_progress(4, f"Detected delimiter: {delimiter}")
             self._send_detailed_message(f"Detected delimiter: '{delimiter}'", "info")
             
             # Read only first few rows to get column info
             self._send_progress(5, "Reading column headers...")
             try:
-                df_sample = pd.read_csv(csv_path, nrows=50, delimiter=delimiter)  # Reduced from 100
-                logger.info(f"📊 CSV has {len(df_sample.columns)} columns: {list(df_sample.columns)}")
-                self._send_detailed_message(f"CSV has {len(df_sample.columns)} columns", "info")
+                if arrow is not None:
+                    # Only the schema is needed; the streaming reader parses just the first block
+                    with pv.open_csv(csv_path, parse_options=pv.ParseOptions(delimiter=delimiter)) as reader:
+                        schema = reader.schema
+                    csv_columns = schema.names
+                    numeric_columns = [field.name for field in schema
+                                       if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)]
+                else:
+                    df_sample = pd.read_csv(csv_path, nrows=50, delimiter=delimiter)  # Reduced from 100
+                    csv_columns = list(df_sample.columns)
+                    numeric_columns = df_sample.select_dtypes(include=[np.number]).columns.tolist()
+                    del df_sample
+                logger.info(f"📊 CSV has {len(csv_columns)} columns: {csv_columns}")
+                self._send_detailed_message(f"CSV has {len(csv_columns)} columns", "info")
             except Exception as e:
                 logger.error(f"❌ Error reading CSV headers: {e}")
                 raise Exception(f"Error reading CSV headers: {str(e)}")
@@ -217,21 +511,15 @@ class UltraSimpleTrainer:
             self._send_progress(6, "Analyzing columns...")
             if not sensor_columns:
                 # Filter out non-sensor columns (metadata columns)
-                exclude_patterns = ['time', 'timestamp', 'date', 'id', 'asset', 'train', 'test', 'status']
-                available_columns = []
-                
-                for col in df_sample.columns:
-                    col_lower = col.lower()
-                    # Include if it's not a metadata column and contains sensor-related keywords
-                    if not any(pattern in col_lower for pattern in exclude_patterns):
-                        available_columns.append(col)
+                available_columns = [col for col in csv_columns if not METADATA_COLUMN_PATTERN.search(col)]
                 
                 logger.info(f"🔍 Auto-detected {len(available_columns)} sensor columns: {available_columns}")
                 self._send_detailed_message(f"Auto-detected {len(available_columns)} sensor columns", "info")
             else:
                 # Use provided sensor columns
-                available_columns = [col for col in sensor_columns if col in df_sample.columns]
-                missing_columns = [col for col in sensor_columns if col not in df_sample.columns]
+                csv_column_set = set(csv_columns)
+                available_columns = [col for col in sensor_columns if col in csv_column_set]
+                missing_columns = [col for col in sensor_columns if col not in csv_column_set]
                 
                 if missing_columns:
                     logger.warning(f"⚠️ Missing columns: {missing_columns}")
@@ -242,14 +530,13 @@ class UltraSimpleTrainer:
             if not available_columns:
                 # If still no columns, use all numeric columns
                 self._send_progress(7, "Falling back to numeric columns...")
-                numeric_columns = df_sample.select_dtypes(include=[np.number]).columns.tolist()
                 available_columns = numeric_columns[:10]  # Reduced from 20 to 10 for speed
                 logger.info(f"🔄 Falling back to first 10 numeric columns: {available_columns}")
                 self._send_detailed_message(f"Using first 10 numeric columns: {available_columns[:5]}...", "info")
             
             if not available_columns:
-                logger.error(f"❌ No suitable sensor columns found. Available columns: {list(df_sample.columns)}")
-                raise ValueError(f"No suitable sensor columns found. Available columns: {list(df_sample.columns)}")
+                logger.error(f"❌ No suitable sensor columns found. Available columns: {csv_columns}")
+                raise ValueError(f"No suitable sensor columns found. Available columns: {csv_columns}")
             
             self._send_progress(8, f"Selected {len(available_columns)} columns")
             self._send_detailed_message(f"Using sensor columns: {', '.join(available_columns[:5])}{'...' if len(available_columns) > 5 else ''}", "info")
@@ -257,12 +544,44 @@ class UltraSimpleTrainer:
             # Read full dataset with only needed columns
             self._send_progress(9, "Loading full dataset...")
             self._send_detailed_message("Loading full dataset with selected columns...", "info")
+            max_samples = 500  # Reduced from 1500 to 500 for much faster training
+            rng = np.random.default_rng(42)
             try:
-                df_sensors = pd.read_csv(csv_path, usecols=available_columns, delimiter=delimiter)
-                logger.info(f"📊 Loaded {len(df_sensors)} rows with {len(available_columns)} sensors")
-                logger.info(f"📊 Data shape: {df_sensors.shape}")
-                logger.info(f"📊 Data types: {df_sensors.dtypes.to_dict()}")
-                self._send_detailed_message(f"Loaded {len(df_sensors)} rows with {len(available_columns)} sensors", "info")
+                if arrow is not None:
+                    # Project the columns inside the parser and decode straight to float32
+                    table = pv.read_csv(
+                        csv_path,
+                        parse_options=pv.ParseOptions(delimiter=delimiter),
+                        convert_options=pv.ConvertOptions(
+                            include_columns=available_columns,
+                            column_types={col: pa.float32() for col in available_columns}
+                        ),
+                        read_options=pv.ReadOptions(use_threads=True)
+                    )
+                    original_size = table.num_rows
+                    missing_before = sum(table.column(col).null_count for col in available_columns)
+                    if missing_before > 0:
+                        # Fill from neighbouring rows of the full file before any rows are dropped
+                        table = pa.table(
+                            [pc.fill_null_backward(pc.fill_null_forward(table.column(col))) for col in available_columns],
+                            names=available_columns
+                        )
+                    if original_size > max_samples:
+                        # Gather only the sampled rows so the full table never becomes an ndarray
+                        table = table.take(np.sort(rng.choice(original_size, max_samples, replace=False)))
+                    # Stack the float32 columns straight into one array, skipping pandas
+                    sensor_data = np.column_stack([table.column(col).to_numpy() for col in available_columns])
+                    del table
+                else:
+                    df_sensors = pd.read_csv(csv_path, usecols=available_columns, delimiter=delimiter)
+                    # Column order follows available_columns (read_csv keeps file order)
+                    sensor_data = df_sensors[available_columns].to_numpy(dtype=np.float32)
+                    del df_sensors
+                    original_size = len(sensor_data)
+                    missing_before = None
+                logger.info(f"📊 Loaded {original_size} rows with {len(available_columns)} sensors")
+                logger.info(f"📊 Data shape: {sensor_data.shape}")
+                self._send_detailed_message(f"Loaded {original_size} rows with {len(available_columns)} sensors", "info")
             except Exception as e:
                 logger.error(f"❌ Error loading full dataset: {e}")
                 raise Exception(f"Error loading full dataset: {str(e)}")
@@ -270,29 +589,36 @@ class UltraSimpleTrainer:
             # Handle missing values
             self._send_progress(10, "Processing missing values...")
             self._send_detailed_message("Handling missing values...", "info")
-            missing_before = df_sensors.isnull().sum().sum()
+            if missing_before is None:
+                missing_mask = np.isnan(sensor_data)
+                missing_before = int(missing_mask.sum())
+                if missing_before > 0:
+                    sensor_data = self._fill_missing(sensor_data, missing_mask)
             logger.info(f"🔍 Missing values before cleanup: {missing_before}")
             
-            df_sensors = df_sensors.ffill().bfill()  # Use newer pandas methods
-            missing_after = df_sensors.isnull().sum().sum()
+            missing_after = int(np.isnan(sensor_data).sum())
             logger.info(f"🔍 Missing values after cleanup: {missing_after}")
             
             if missing_before > 0:
                 logger.warning(f"⚠️ Handled {missing_before - missing_after} missing values")
                 self._send_detailed_message(f"Handled {missing_before - missing_after} missing values", "warning")
             
-            if df_sensors.empty:
+            if sensor_data.size == 0:
                 logger.error("❌ No data remaining after handling missing values")
                 raise ValueError("No data remaining after handling missing values")
             
             # Limit data size for faster training and memory efficiency
             self._send_progress(12, "Sampling data...")
-            original_size = len(df_sensors)
-            max_samples = 500  # Reduced from 1500 to 500 for much faster training
-            if len(df_sensors) > max_samples:
-                df_sensors = df_sensors.sample(n=max_samples, random_state=42)
-                logger.info(f"📊 Sampled {len(df_sensors)} rows from {original_size} for ultra-fast training")
-                self._send_detailed_message(f"Sampled {len(df_sensors)} rows from {original_size} for ultra-fast training", "info")
+            if len(sensor_data) > max_samples:
+                # Sorted indices keep the gather sequential and the result C-contiguous
+                idx = rng.choice(original_size, max_samples, replace=False)
+                sensor_data = sensor_data[np.sort(idx)]
+            if original_size > max_samples:
+                # Rows were gathered in file order for sequential reads; shuffle them
+                # once so the validation split is not the tail of the recording
+                sensor_data = sensor_data[rng.permutation(len(sensor_data))]
+                logger.info(f"📊 Sampled {len(sensor_data)} rows from {original_size} for ultra-fast training")
+                self._send_detailed_message(f"Sampled {len(sensor_data)} rows from {original_size} for ultra-fast training", "info")
             
             # Scale the data
             self._send_progress(15, "Scaling data...")
@@ -305,41 +631,33 @@ class UltraSimpleTrainer:
                     self.scaler = pretrained_scaler
                     
                     # Check if column names match
-                    try:
-                        scaled_data = self.scaler.transform(df_sensors)  # Use transform instead of fit_transform
+                    feature_names = getattr(self.scaler, 'feature_names_in_', None)
+                    if feature_names is not None and list(feature_names) != list(available_columns):
+                        logger.warning(f"⚠️ Column names don't match pretrained scaler, creating new scaler")
+                        logger.warning(f"⚠️ Scaler columns: {list(feature_names)}")
+                        scaled_data = self._fit_scaler(sensor_data, available_columns)
+                        logger.info(f"✅ Data scaled using new scaler (column mismatch)")
+                    else:
+                        scaled_data = self._standardize(sensor_data)
                         logger.info(f"✅ Data scaled using pretrained scaler")
-                    except ValueError as e:
-                        if "feature names should match" in str(e):
-                            logger.warning(f"⚠️ Column names don't match pretrained scaler, creating new scaler")
-                            logger.warning(f"⚠️ Error: {str(e)}")
-                            self.scaler = StandardScaler()
-                            scaled_data = self.scaler.fit_transform(df_sensors)
-                            logger.info(f"✅ Data scaled using new scaler (column mismatch)")
-                        else:
-                            raise e
                 else:
                     logger.info(f"🔄 Creating new scaler for data scaling")
-                    self.scaler = StandardScaler()
-                    scaled_data = self.scaler.fit_transform(df_sensors)
+                    scaled_data = self._fit_scaler(sensor_data, available_columns)
                     logger.info(f"✅ Data scaled using new scaler")
                 
                 # Log scaling statistics
                 logger.info(f"📊 Data scaling completed")
                 logger.info(f"📊 Scaled data shape: {scaled_data.shape}")
-                logger.info(f"📊 Scaled data mean: {np.mean(scaled_data, axis=0)}")
-                logger.info(f"📊 Scaled data std: {np.std(scaled_data, axis=0)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"📊 Scaled data mean: {np.mean(scaled_data, axis=0)}")
+                    logger.debug(f"📊 Scaled data std: {np.std(scaled_data, axis=0)}")
                 
                 self._send_detailed_message(f"Data scaled successfully", "success")
             except Exception as e:
                 logger.error(f"❌ Error scaling data: {e}")
                 raise Exception(f"Error scaling data: {str(e)}")
             
-            # Clean up pandas dataframe to free memory
-            del df_sensors
-            gc.collect()
-            
-            end_time = pd.Timestamp.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.monotonic() - start_time
             logger.info(f"✅ Data preprocessing completed in {duration:.2f} seconds")
             
             self._send_progress(20, f"Preprocessed {len(scaled_data)} samples")
@@ -351,11 +669,77 @@ class UltraSimpleTrainer:
             self._send_detailed_message(f"Error loading data: {str(e)}", "error")
             raise
     
-    def build_simple_model(self, input_shape: int) -> Sequential:
+    @staticmethod
+    def _detect_delimiter(sample: bytes) -> str:
+        """Detect the CSV delimiter (comma or semicolon) from a raw sample of the file."""
+        if b';' not in sample:
+            return ','
+        # The sample ends wherever the read stopped; sniff only complete lines
+        end = sample.rfind(b'\n')
+        if end > 0:
+            sample = sample[:end]
+        try:
+            return csv.Sniffer().sniff(sample.decode('utf-8', 'replace'), delimiters=',;').delimiter
+        except csv.Error:
+            return ','
+    
+    @staticmethod
+    def _fill_missing(data: np.ndarray, missing: np.ndarray) -> np.ndarray:
+        """Forward-fill then back-fill NaNs per column with vectorized index scans."""
+        rows = np.arange(data.shape[0])[:, None]
+        cols = np.arange(data.shape[1])
+        
+        # Forward fill: each cell takes the last valid row at or above it
+        idx = np.where(missing, 0, rows)
+        np.maximum.accumulate(idx, axis=0, out=idx)
+        data = data[idx, cols]
+        
+        # Back fill the leading gaps: take the next valid row at or below
+        missing = np.isnan(data)
+        if missing.any():
+            idx = np.where(missing, data.shape[0] - 1, rows)
+            idx = np.minimum.accumulate(idx[::-1], axis=0)[::-1]
+            data = data[idx, cols]
+        return data
+    
+    def _fit_scaler(self, data: np.ndarray, columns: List[str]) -> np.ndarray:
+        """Standardize the data in float32 and keep the fit as a StandardScaler."""
+        mean = data.mean(axis=0, dtype=np.float32)
+        var = data.var(axis=0, dtype=np.float32)
+        scale = np.sqrt(var)
+        scale[scale == 0] = 1.0
+        
+        # Store the statistics on a regular fitted StandardScaler so scaler.pkl
+        # stays loadable by simple_predictor.py and as a pretrained scaler
+        from sklearn.preprocessing import StandardScaler
+        scaler = StandardScaler()
+        scaler.mean_ = mean.astype(np.float64)
+        scaler.var_ = var.astype(np.float64)
+        scaler.scale_ = scale.astype(np.float64)
+        scaler.n_samples_seen_ = data.shape[0]
+        scaler.n_features_in_ = data.shape[1]
+        scaler.feature_names_in_ = np.asarray(columns, dtype=object)
+        self.scaler = scaler
+        
+        return self._standardize(data)
+    
+    def _standardize(self, data: np.ndarray) -> np.ndarray:
+        """Apply self.scaler to a float32 array in place, skipping sklearn's input validation."""
+        mean = self.scaler.mean_.astype(np.float32)
+        inv_scale = np.reciprocal(self.scaler.scale_.astype(np.float32))
+        np.subtract(data, mean, out=data)
+        np.multiply(data, inv_scale, out=data)
+        return data
+    
+    def build_simple_model(self, input_shape: int, X_train: np.ndarray = None) -> 'Sequential':
         """Build a very simple neural network with aggressive memory optimization and logging."""
+        _import_tensorflow()
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Dense
+        
         self._send_detailed_message("Creating ultra-simple autoencoder architecture...", "info")
         
-        start_time = pd.Timestamp.now()
+        start_time = time.monotonic()
         logger.info(f"🏗️ Building model with input shape: {input_shape}")
         
         # Try to load pretrained model first
@@ -368,23 +752,28 @@ class UltraSimpleTrainer:
             pretrained_model.compile(
                 optimizer='adam',
                 loss='mse',
-                metrics=['mae']
+                metrics=['mae'],
+                jit_compile=True  # XLA fuses each Dense block's matmul/bias/activation
             )
             
             param_count = pretrained_model.count_params()
-            end_time = pd.Timestamp.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.monotonic() - start_time
             
             logger.info(f"🏗️ Pretrained model loaded successfully in {duration:.2f}s")
             logger.info(f"🏗️ Total parameters: {param_count:,}")
-            logger.info(f"🏗️ Model summary:")
             
-            # Log model summary
-            pretrained_model.summary(print_fn=logger.info)
+            # Log model summary (walks every layer, so only when debugging)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"🏗️ Model summary:")
+                pretrained_model.summary(print_fn=logger.debug)
             
             self._send_detailed_message(f"Loaded pretrained model with {param_count:,} parameters in {duration:.2f}s", "success")
             return pretrained_model
         
+        # Small inputs: fit a PCA autoencoder in closed form rather than training
+        if X_train is not None and PCA_MIN_FEATURES <= input_shape <= PCA_MAX_FEATURES:
+            return self._build_pca_model(X_train)
+        
         # If no pretrained model available, build new one
         logger.info(f"🔄 Building new model from scratch")
         self._send_detailed_message("Building new model from scratch", "info")
@@ -396,38 +785,88 @@ class UltraSimpleTrainer:
             Dense(4, activation='relu'),   # New bottleneck layer
             Dense(8, activation='relu'),   # Decoder
             Dense(16, activation='relu'),  # Decoder
-            Dense(input_shape, activation='linear')
+            Dense(input_shape, activation='linear', dtype='float32')  # Output stays float32 under mixed precision
         ])
         
         logger.info(f"🏗️ Model architecture created with {len(model.layers)} layers")
         
         model.compile(
-            optimizer='adam',
+            optimizer=self._create_optimizer(),
             loss='mse',
-            metrics=['mae']
+            metrics=['mae'],
+            jit_compile=True  # XLA fuses each Dense block's matmul/bias/activation
         )
         
         param_count = model.count_params()
-        end_time = pd.Timestamp.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.monotonic() - start_time
         
         logger.info(f"🏗️ Model compiled successfully in {duration:.2f}s")
         logger.info(f"🏗️ Total parameters: {param_count:,}")
-        logger.info(f"🏗️ Model summary:")
         
-        # Log model summary
-        model.summary(print_fn=logger.info)
+        # Log model summary (walks every layer, so only when debugging)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"🏗️ Model summary:")
+            model.summary(print_fn=logger.debug)
         
         self._send_detailed_message(f"Built ultra-simple autoencoder with {param_count:,} parameters in {duration:.2f}s", "success")
         return model
     
+    def _build_pca_model(self, X_train: np.ndarray) -> 'Sequential':
+        """Fit a PCA projection with one SVD and wrap it as a linear Keras autoencoder.
+        
+        Reconstruction is (X - mean) @ V @ V.T + mean, stored as two linear Dense
+        layers so model.h5 loads and predicts like the trained autoencoder. This
+        replaces the neural model for every dataset of PCA_MIN_FEATURES to
+        PCA_MAX_FEATURES sensors that has no matching pretrained model.
+        """
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Dense
+        
+        start_time = time.monotonic()
+        input_shape = X_train.shape[1]
+        # Keep strictly fewer components than sensors so reconstruction is lossy
+        n_components = max(1, input_shape // 2)
+        if n_components >= input_shape:
+            raise ValueError(f"PCA autoencoder needs at least {PCA_MIN_FEATURES} sensors, got {input_shape}")
+        logger.info(f"🔄 Fitting PCA autoencoder with {n_components} components")
+        self._send_detailed_message(f"Fitting PCA model with {n_components} components for {input_shape} sensors", "info")
+        
+        # Fit on the training rows only, leaving the validation tail unseen
+        split_at = int(np.ceil(len(X_train) * (1 - VALIDATION_SPLIT)))
+        fit_data = X_train[:split_at]
+        mean = fit_data.mean(axis=0, dtype=np.float32)
+        _, _, vt = np.linalg.svd(fit_data - mean, full_matrices=False)
+        components = np.ascontiguousarray(vt[:n_components].T, dtype=np.float32)
+        
+        model = Sequential([
+            Dense(n_components, activation='linear', input_shape=(input_shape,), dtype='float32'),
+            Dense(input_shape, activation='linear', dtype='float32')
+        ])
+        model.layers[0].set_weights([components, -mean @ components])
+        model.layers[1].set_weights([np.ascontiguousarray(components.T), mean])
+        model.compile(optimizer=self._create_optimizer(), loss='mse', metrics=['mae'])
+        model._is_pca = True
+        
+        duration = time.monotonic() - start_time
+        logger.info(f"🏗️ PCA model fitted in {duration:.2f}s")
+        self._send_detailed_message(f"Fitted PCA model with {model.count_params():,} parameters in {duration:.2f}s", "success")
+        return model
+    
+    def _create_optimizer(self) -> 'tf.keras.optimizers.Optimizer':
+        """Adam, wrapped with dynamic loss scaling when training in float16."""
+        tf = _import_tensorflow()
+        optimizer = tf.keras.optimizers.Adam()
+        if tf.keras.mixed_precision.global_policy().name == 'mixed_float16':
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+        return optimizer
+    
     def train_model(self, X_train: np.ndarray) -> Dict:
         """Train the model with aggressive memory optimization and comprehensive logging."""
         self._send_progress(25, "Starting model training...")
         self._send_detailed_message("Initializing ultra-fast training process...", "info")
         
-        start_time = pd.Timestamp.now()
-        logger.info(f"🚀 Starting model training at {start_time}")
+        start_time = time.monotonic()
+        logger.info(f"🚀 Starting model training at {datetime.now()}")
         logger.info(f"📊 Training data shape: {X_train.shape}")
         logger.info(f"📊 Training data type: {X_train.dtype}")
         logger.info(f"📊 Training data memory usage: {X_train.nbytes / 1024 / 1024:.1f}MB")
@@ -437,7 +876,11 @@ class UltraSimpleTrainer:
         
         # Build model
         self._send_progress(30, "Building neural network...")
-        self.model = self.build_simple_model(X_train.shape[1])
+        self.model = self.build_simple_model(X_train.shape[1], X_train)
+        
+        # The PCA model is already fitted; just report its reconstruction losses
+        if getattr(self.model, '_is_pca', False):
+            return self._pca_metrics(X_train, start_time)
         
         # Train model with very simple settings for speed
         is_pretrained = hasattr(self.model, '_is_pretrained') or (self.pretrained_config and len(self.pretrained_config.get('trained_columns', [])) == X_train.shape[1])
@@ -451,8 +894,8 @@ class UltraSimpleTrainer:
             logger.info(f"🎯 Training from scratch - using {epochs} epochs")
             self._send_detailed_message(f"Training new model for {epochs} epochs", "info")
         
-        batch_size = 32  # Increased from 16 to 32 for speed
-        validation_split = 0.2
+        batch_size = 128  # The model is a few KB; wider GEMMs keep the SIMD units busy
+        validation_split = VALIDATION_SPLIT
         
         logger.info(f"🎯 Training configuration:")
         logger.info(f"   - Epochs: {epochs}")
@@ -464,55 +907,32 @@ class UltraSimpleTrainer:
         
         self._send_detailed_message(f"Training for {epochs} epochs with batch size {batch_size} for speed", "info")
         
-        # Custom training loop for better progress tracking
-        history = {'loss': [], 'val_loss': []}
+        # Split off the validation rows up front (as validation_split would) so
+        # both sides can be fed from cached, prefetched datasets
+        split_at = int(np.ceil(len(X_train) * (1 - validation_split)))
+        train_ds = self._make_dataset(X_train[:split_at], batch_size, shuffle=True)
+        val_ds = self._make_dataset(X_train[split_at:], batch_size)
         
-        for epoch in range(epochs):
-            epoch_start_time = pd.Timestamp.now()
-            epoch_start_progress = 35 + (epoch * 20)  # More progress per epoch
-            self._send_progress(epoch_start_progress, f"Training epoch {epoch + 1}/{epochs}")
-            self._send_detailed_message(f"Starting epoch {epoch + 1}/{epochs}...", "info")
-            
-            logger.info(f"🔄 Starting epoch {epoch + 1}/{epochs} at {epoch_start_time}")
-            
-            # Train for one epoch
-            epoch_history = self.model.fit(
-                X_train, X_train,
-                epochs=1,
-                batch_size=batch_size,
-                validation_split=validation_split,
-                verbose=1
-            )
-            
-            # Send heartbeat during training to keep connection alive
-            self._send_heartbeat()
-            
-            # Record metrics
-            history['loss'].extend(epoch_history.history['loss'])
-            history['val_loss'].extend(epoch_history.history.get('val_loss', epoch_history.history['loss']))
-            
-            # Send epoch completion message
-            current_loss = history['loss'][-1]
-            val_loss = history['val_loss'][-1]
-            epoch_end_progress = epoch_start_progress + 15
-            epoch_end_time = pd.Timestamp.now()
-            epoch_duration = (epoch_end_time - epoch_start_time).total_seconds()
-            
-            logger.info(f"✅ Epoch {epoch + 1}/{epochs} completed in {epoch_duration:.2f}s")
-            logger.info(f"   - Training loss: {current_loss:.6f}")
-            logger.info(f"   - Validation loss: {val_loss:.6f}")
-            logger.info(f"   - Loss improvement: {history['loss'][-2] - current_loss:.6f}" if len(history['loss']) > 1 else "   - First epoch")
-            
-            self._send_progress(epoch_end_progress, f"Epoch {epoch + 1}/{epochs} completed")
-            self._send_detailed_message(f"Epoch {epoch + 1}/{epochs} completed in {epoch_duration:.2f}s - Loss: {current_loss:.6f}, Val Loss: {val_loss:.6f}", "success")
-            
-            # Clean up memory after each epoch
-            self._cleanup_memory()
+        # Train all epochs in one fit() call; per-epoch reporting happens in the callback
+        fit_history = self.model.fit(
+            train_ds,
+            validation_data=val_ds,
+            epochs=epochs,
+            verbose=1,
+            callbacks=[self._create_progress_callback(epochs)]
+        )
+        history = {
+            'loss': fit_history.history['loss'],
+            'val_loss': fit_history.history.get('val_loss', fit_history.history['loss'])
+        }
+        
+        # Drop the dataset caches; memory is collected once the model is saved
+        del train_ds, val_ds
         
         # Calculate training metrics
         train_loss = history['loss'][-1]
         val_loss = history['val_loss'][-1]
-        total_duration = (pd.Timestamp.now() - start_time).total_seconds()
+        total_duration = time.monotonic() - start_time
         
         logger.info(f"🎉 Training completed in {total_duration:.2f} seconds")
         logger.info(f"📊 Final metrics:")
@@ -528,56 +948,177 @@ class UltraSimpleTrainer:
             'epochs_trained': len(history['loss']),
             'training_samples': len(X_train),
             'training_duration': total_duration,
-            'avg_epoch_time': total_duration / epochs
+            'avg_epoch_time': total_duration / epochs,
+            'training_algorithm': 'simple_autoencoder',
+            'model_architecture': self._describe_architecture('autoencoder', 'adam')
         }
         
         self._send_progress(80, f"Training completed. Final loss: {train_loss:.4f}")
         self._send_detailed_message(f"Training completed in {total_duration:.2f}s! Final loss: {train_loss:.6f}, Validation loss: {val_loss:.6f}", "success")
         return metrics
     
+    def _pca_metrics(self, X_train: np.ndarray, start_time: float) -> Dict:
+        """Training metrics for the closed-form PCA model, in train_model's format."""
+        split_at = int(np.ceil(len(X_train) * (1 - VALIDATION_SPLIT)))
+        mse_errors = self._reconstruction_errors(X_train)
+        train_loss = float(mse_errors[:split_at].mean())
+        val_loss = float(mse_errors[split_at:].mean()) if split_at < len(X_train) else train_loss
+        total_duration = time.monotonic() - start_time
+        
+        logger.info(f"🎉 PCA model ready in {total_duration:.2f} seconds")
+        logger.info(f"📊 Final metrics:")
+        logger.info(f"   - Final training loss: {train_loss:.6f}")
+        logger.info(f"   - Final validation loss: {val_loss:.6f}")
+        logger.info(f"   - Training samples: {len(X_train)}")
+        
+        metrics = {
+            'final_loss': train_loss,
+            'final_val_loss': val_loss,
+            'epochs_trained': 0,
+            'training_samples': len(X_train),
+            'training_duration': total_duration,
+            'avg_epoch_time': 0.0,
+            'training_algorithm': 'pca_autoencoder',
+            'model_architecture': self._describe_architecture('pca_autoencoder', 'closed_form_svd')
+        }
+        
+        self._send_progress(80, f"Training completed. Final loss: {train_loss:.4f}")
+        self._send_detailed_message(f"PCA model fitted in {total_duration:.2f}s! Final loss: {train_loss:.6f}, Validation loss: {val_loss:.6f}", "success")
+        return metrics
+    
+    def _describe_architecture(self, model_type: str, optimizer: str) -> Dict:
+        """The model_architecture record Node stores for the model that was actually built."""
+        layers = self.model.layers
+        return {
+            'type': model_type,
+            'layers': [f"dense_{layer.units}" if hasattr(layer, 'units') else layer.name for layer in layers[:-1]] + ['dense_output'],
+            'activation': layers[0].get_config().get('activation', 'linear'),
+            'output_activation': layers[-1].get_config().get('activation', 'linear'),
+            'loss_function': 'mse',
+            'optimizer': optimizer
+        }
+    
+    def _make_dataset(self, data: np.ndarray, batch_size: int, shuffle: bool = False) -> 'tf.data.Dataset':
+        """Build a cached, prefetched autoencoder dataset (input = target)."""
+        tf = _import_tensorflow()
+        dataset = tf.data.Dataset.from_tensor_slices((data, data)).cache()
+        if shuffle:
+            dataset = dataset.shuffle(len(data))
+        
+        options = tf.data.Options()
+        options.deterministic = False
+        return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE).with_options(options)
+    
+    def _create_progress_callback(self, epochs: int):
+        """Create a callback that reports per-epoch progress to Node.js."""
+        tf = _import_tensorflow()
+        class ProgressCallback(tf.keras.callbacks.Callback):
+            def __init__(self, trainer):
+                super().__init__()
+                self.trainer = trainer
+                self.epoch_start_time = None
+                self.previous_loss = None
+            
+            def on_epoch_begin(self, epoch, logs=None):
+                self.epoch_start_time = time.monotonic()
+                epoch_start_progress = 35 + (epoch * 20)  # More progress per epoch
+                self.trainer._send_progress(epoch_start_progress, f"Training epoch {epoch + 1}/{epochs}")
+                self.trainer._send_detailed_message(f"Starting epoch {epoch + 1}/{epochs}...", "info")
+                
+                logger.info(f"🔄 Starting epoch {epoch + 1}/{epochs} at {datetime.now()}")
+            
+            def on_epoch_end(self, epoch, logs=None):
+                # Send heartbeat during training to keep connection alive
+                self.trainer._send_heartbeat()
+                
+                # Send epoch completion message
+                logs = logs or {}
+                current_loss = logs.get('loss', 0)
+                val_loss = logs.get('val_loss', current_loss)
+                epoch_end_progress = 35 + (epoch * 20) + 15
+                epoch_duration = time.monotonic() - self.epoch_start_time
+                
+                logger.info(f"✅ Epoch {epoch + 1}/{epochs} completed in {epoch_duration:.2f}s")
+                logger.info(f"   - Training loss: {current_loss:.6f}")
+                logger.info(f"   - Validation loss: {val_loss:.6f}")
+                logger.info(f"   - Loss improvement: {self.previous_loss - current_loss:.6f}" if self.previous_loss is not None else "   - First epoch")
+                self.previous_loss = current_loss
+                
+                self.trainer._send_progress(epoch_end_progress, f"Epoch {epoch + 1}/{epochs} completed")
+                self.trainer._send_detailed_message(f"Epoch {epoch + 1}/{epochs} completed in {epoch_duration:.2f}s - Loss: {current_loss:.6f}, Val Loss: {val_loss:.6f}", "success")
+                self.trainer._flush_messages()
+        
+        return ProgressCallback(self)
+    
+    def _forward_pass(self, X: np.ndarray) -> np.ndarray:
+        """Run the autoencoder on X in float32 as NumPy matmuls.
+        
+        Every model this trainer builds (PCA, the Dense autoencoder and the shipped
+        pretrained stack) is relu/linear Dense layers. Only a replaced pretrained
+        model.h5 with other layers takes the single eager Keras call below.
+        """
+        from tensorflow.keras.layers import Dense
+        
+        layers = []
+        for layer in self.model.layers:
+            activation = layer.get_config().get('activation')
+            if not isinstance(layer, Dense) or activation not in ('relu', 'linear'):
+                return np.asarray(self.model(X, training=False), dtype=np.float32)
+            kernel, bias = layer.get_weights()
+            layers.append((kernel.astype(np.float32), bias.astype(np.float32), activation == 'relu'))
+        
+        out = X.astype(np.float32, copy=False)
+        for kernel, bias, relu in layers:
+            out = out @ kernel
+            out += bias
+            if relu:
+                np.maximum(out, 0, out=out)
+        return out
+    
+    def _reconstruction_errors(self, X: np.ndarray) -> np.ndarray:
+        """Per-row MSE between X and its reconstruction, reusing the prediction buffer."""
+        residual = self._forward_pass(X)
+        if not residual.flags.writeable:
+            residual = residual.copy()
+        np.subtract(X, residual, out=residual)
+        return np.einsum('ij,ij->i', residual, residual) / residual.shape[1]
+    
+    @staticmethod
+    def _quantiles(values: np.ndarray, qs: List[float]) -> np.ndarray:
+        """Linearly interpolated quantiles (same as np.percentile) via one O(N) partition."""
+        positions = (len(values) - 1) * np.asarray(qs, dtype=np.float64)
+        lower = np.floor(positions).astype(np.intp)
+        upper = np.minimum(lower + 1, len(values) - 1)
+        part = np.partition(values, np.unique(np.concatenate([lower, upper])))
+        return part[lower] + (part[upper] - part[lower]) * (positions - lower)
+    
     def calculate_threshold(self, X_train: np.ndarray) -> Dict:
         """Calculate anomaly threshold based on reconstruction error with optimization and logging."""
         self._send_progress(85, "Calculating anomaly threshold...")
         self._send_detailed_message("Computing reconstruction errors...", "info")
         
-        start_time = pd.Timestamp.now()
-        logger.info(f"🔍 Starting threshold calculation at {start_time}")
+        start_time = time.monotonic()
+        logger.info(f"🔍 Starting threshold calculation at {datetime.now()}")
         logger.info(f"📊 Input data shape: {X_train.shape}")
         
-        # Get reconstruction errors in larger batches for speed
-        batch_size = 200  # Increased from 100 for speed
-        mse_errors = []
-        total_batches = (len(X_train) + batch_size - 1) // batch_size
-        
-        logger.info(f"🔍 Processing {total_batches} batches with batch size {batch_size}")
-        
-        for i in range(0, len(X_train), batch_size):
-            batch_start = i
-            batch_end = min(i + batch_size, len(X_train))
-            batch = X_train[batch_start:batch_end]
-            
-            logger.debug(f"🔍 Processing batch {i//batch_size + 1}/{total_batches} (samples {batch_start}-{batch_end-1})")
-            
-            predictions = self.model.predict(batch, verbose=0)
-            batch_errors = np.mean((batch - predictions) ** 2, axis=1)
-            mse_errors.extend(batch_errors)
-            
-            # Send heartbeat during long computation
-            if i % 1000 == 0:  # Reduced frequency
-                self._send_heartbeat()
-                logger.debug(f"💓 Heartbeat sent at batch {i//batch_size + 1}")
-        
-        mse_errors = np.array(mse_errors)
+        # Get reconstruction errors with a single forward pass, in NumPy when
+        # the model is a plain Dense stack to skip TensorFlow's dispatch overhead
+        self._send_heartbeat()
+        mse_errors = self._reconstruction_errors(X_train)
         
         logger.info(f"🔍 Reconstruction errors calculated for {len(mse_errors)} samples")
+        mean_error = float(np.mean(mse_errors))
+        std_error = float(np.std(mse_errors))
+        min_error = float(np.min(mse_errors))
+        max_error = float(np.max(mse_errors))
         logger.info(f"🔍 Error statistics:")
-        logger.info(f"   - Mean: {np.mean(mse_errors):.6f}")
-        logger.info(f"   - Std: {np.std(mse_errors):.6f}")
-        logger.info(f"   - Min: {np.min(mse_errors):.6f}")
-        logger.info(f"   - Max: {np.max(mse_errors):.6f}")
+        logger.info(f"   - Mean: {mean_error:.6f}")
+        logger.info(f"   - Std: {std_error:.6f}")
+        logger.info(f"   - Min: {min_error:.6f}")
+        logger.info(f"   - Max: {max_error:.6f}")
         
         # Calculate threshold as 95th percentile of errors
-        threshold = np.percentile(mse_errors, 95)
+        percentile_90, threshold, percentile_99 = self._quantiles(mse_errors, [0.90, 0.95, 0.99])
         
         # If we have a pretrained threshold, use it as a reference
         pretrained_threshold = self.pretrained_config.get('threshold') if self.pretrained_config else None
@@ -597,13 +1138,13 @@ class UltraSimpleTrainer:
         # Calculate additional statistics
         stats = {
             'threshold': float(threshold),
-            'mean_error': float(np.mean(mse_errors)),
-            'std_error': float(np.std(mse_errors)),
-            'min_error': float(np.min(mse_errors)),
-            'max_error': float(np.max(mse_errors)),
-            'percentile_90': float(np.percentile(mse_errors, 90)),
+            'mean_error': mean_error,
+            'std_error': std_error,
+            'min_error': min_error,
+            'max_error': max_error,
+            'percentile_90': float(percentile_90),
             'percentile_95': float(threshold),
-            'percentile_99': float(np.percentile(mse_errors, 99))
+            'percentile_99': float(percentile_99)
         }
         
         # Add pretrained reference if available
@@ -611,8 +1152,7 @@ class UltraSimpleTrainer:
             stats['pretrained_threshold'] = float(pretrained_threshold)
             stats['threshold_improvement'] = float(threshold - pretrained_threshold)
         
-        end_time = pd.Timestamp.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.monotonic() - start_time
         
         logger.info(f"✅ Threshold calculation completed in {duration:.2f}s")
         logger.info(f"🎯 Anomaly threshold: {threshold:.6f} (95th percentile)")
@@ -627,73 +1167,74 @@ class UltraSimpleTrainer:
     
     def save_model(self, sensor_columns: List[str], training_stats: Dict):
         """Save the trained model and metadata with comprehensive logging."""
+        import joblib
+        
         self._send_progress(90, "Saving model and metadata...")
         self._send_detailed_message("Saving trained model...", "info")
         
-        start_time = pd.Timestamp.now()
-        logger.info(f"💾 Starting model save at {start_time}")
+        start_time = time.monotonic()
+        logger.info(f"💾 Starting model save at {datetime.now()}")
         logger.info(f"📁 Save directory: {self.model_dir}")
         
         try:
-            # Save the trained model
-            model_path = os.path.join(self.model_dir, 'model.h5')
-            logger.info(f"💾 Saving model to: {model_path}")
-            self.model.save(model_path)
-            logger.info(f"✅ Model saved successfully: {os.path.getsize(model_path):,} bytes")
-            self._send_detailed_message("Model saved successfully", "success")
-            
-            # Save the scaler
-            scaler_path = os.path.join(self.model_dir, 'scaler.pkl')
-            logger.info(f"💾 Saving scaler to: {scaler_path}")
-            joblib.dump(self.scaler, scaler_path)
-            logger.info(f"✅ Scaler saved successfully: {os.path.getsize(scaler_path):,} bytes")
-            self._send_detailed_message("Data scaler saved", "success")
-            
-            # Save column configuration
-            columns_path = os.path.join(self.model_dir, 'columns.json')
-            logger.info(f"💾 Saving column config to: {columns_path}")
-            with open(columns_path, 'w') as f:
-                json.dump(sensor_columns, f, indent=2)
-            logger.info(f"✅ Column config saved successfully: {os.path.getsize(columns_path):,} bytes")
-            self._send_detailed_message("Column configuration saved", "success")
-            
-            # Save threshold configuration
-            threshold_path = os.path.join(self.model_dir, 'threshold.json')
-            logger.info(f"💾 Saving threshold config to: {threshold_path}")
-            with open(threshold_path, 'w') as f:
-                json.dump(training_stats, f, indent=2)
-            logger.info(f"✅ Threshold config saved successfully: {os.path.getsize(threshold_path):,} bytes")
-            
-            # Save training statistics
-            training_stats_path = os.path.join(self.model_dir, 'training_stats.json')
-            logger.info(f"💾 Saving training stats to: {training_stats_path}")
-            
-            # Add metadata to training stats
-            full_stats = {
-                **training_stats,
+            paths = {name: os.path.join(self.model_dir, filename) for name, filename in ARTIFACT_FILES.items()}
+            
+            # Metadata appended to the threshold stats in training_stats.json
+            stats_metadata = {
                 'sensor_columns': sensor_columns,
                 'model_type': 'simple_autoencoder',
-                'training_timestamp': pd.Timestamp.now().isoformat(),
-                'model_path': model_path,
-                'scaler_path': scaler_path,
-                'columns_path': columns_path,
-                'threshold_path': threshold_path
+                'training_timestamp': datetime.now().isoformat(),
+                'model_path': paths['model'],
+                'scaler_path': paths['scaler'],
+                'columns_path': paths['columns'],
+                'threshold_path': paths['threshold']
             }
             
-            with open(training_stats_path, 'w') as f:
-                json.dump(full_stats, f, indent=2)
-            logger.info(f"✅ Training stats saved successfully: {os.path.getsize(training_stats_path):,} bytes")
-            self._send_detailed_message("Training statistics saved", "success")
+            def save_trained_model():
+                logger.info(f"💾 Saving model to: {paths['model']}")
+                # Predictors only run inference, so skip writing the Adam slot variables
+                self.model.save(paths['model'], include_optimizer=False)
+                logger.info("✅ Model saved successfully")
+                self._send_detailed_message("Model saved successfully", "success")
+            
+            def save_scaler():
+                logger.info(f"💾 Saving scaler to: {paths['scaler']}")
+                joblib.dump(self.scaler, paths['scaler'])
+                logger.info("✅ Scaler saved successfully")
+                self._send_detailed_message("Data scaler saved", "success")
+            
+            def save_metadata():
+                logger.info(f"💾 Saving column config to: {paths['columns']}")
+                columns_size = self._write_json(paths['columns'], sensor_columns)
+                logger.info(f"✅ Column config saved successfully: {columns_size:,} bytes")
+                self._send_detailed_message("Column configuration saved", "success")
+                
+                logger.info(f"💾 Saving threshold config to: {paths['threshold']}")
+                threshold_size = self._write_json(paths['threshold'], training_stats)
+                logger.info(f"✅ Threshold config saved successfully: {threshold_size:,} bytes")
+                
+                # training_stats.json is threshold.json plus metadata
+                logger.info(f"💾 Saving training stats to: {paths['stats']}")
+                stats_size = self._write_json(paths['stats'], training_stats | stats_metadata)
+                logger.info(f"✅ Training stats saved successfully: {stats_size:,} bytes")
+                self._send_detailed_message("Training statistics saved", "success")
             
-            end_time = pd.Timestamp.now()
-            duration = (end_time - start_time).total_seconds()
+            # The files are independent, so the HDF5 save (the long pole) overlaps
+            # with the pickle and JSON writes; result() re-raises any failure
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [executor.submit(task) for task in (save_trained_model, save_scaler, save_metadata)]
+                for future in futures:
+                    future.result()
+            
+            duration = time.monotonic() - start_time
             
             logger.info(f"✅ All files saved successfully in {duration:.2f}s")
-            logger.info(f"📁 Model directory contents:")
-            for file in os.listdir(self.model_dir):
-                file_path = os.path.join(self.model_dir, file)
-                file_size = os.path.getsize(file_path)
-                logger.info(f"   - {file}: {file_size:,} bytes")
+            # Listing stats every file, so skip it when INFO is off
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("📁 Model directory contents:")
+                with os.scandir(self.model_dir) as entries:
+                    for entry in entries:
+                        logger.info(f"   - {entry.name}: {entry.stat().st_size:,} bytes")
             
             self._send_detailed_message("All files saved successfully!", "success")
             
@@ -702,10 +1243,26 @@ class UltraSimpleTrainer:
             self._send_detailed_message(f"Error saving model: {str(e)}", "error")
             raise
     
+    @staticmethod
+    def _encode_json(obj) -> bytes:
+        return _dumps_indented(obj)
+    
+    @staticmethod
+    def _write_bytes(path: str, data: bytes) -> int:
+        """Write data with a single buffered write; returns bytes written."""
+        with open(path, 'wb', buffering=1 << 16) as f:
+            f.write(data)
+        return len(data)
+    
+    @classmethod
+    def _write_json(cls, path: str, obj) -> int:
+        """Serialize obj once and write it with a single buffered write; returns bytes written."""
+        return cls._write_bytes(path, cls._encode_json(obj))
+    
     def train(self, csv_path: str, sensor_columns: List[str]) -> Dict:
         """Complete training pipeline with comprehensive logging."""
-        start_time = pd.Timestamp.now()
-        logger.info(f"🚀 Starting complete training pipeline at {start_time}")
+        start_time = time.monotonic()
+        logger.info(f"🚀 Starting complete training pipeline at {datetime.now()}")
         logger.info(f"👤 User ID: {self.user_id}")
         logger.info(f"🔧 Machine ID: {self.machine_id}")
         logger.info(f"📁 CSV path: {csv_path}")
@@ -717,41 +1274,42 @@ class UltraSimpleTrainer:
             logger.info("STEP 1: DATA PREPROCESSING")
             logger.info("=" * 50)
             X_train, final_sensor_columns = self.load_and_preprocess_data(csv_path, sensor_columns)
+            self._flush_messages()
             
             # Step 2: Train the model
             logger.info("=" * 50)
             logger.info("STEP 2: MODEL TRAINING")
             logger.info("=" * 50)
             training_metrics = self.train_model(X_train)
+            self._flush_messages()
             
             # Step 3: Calculate threshold
             logger.info("=" * 50)
             logger.info("STEP 3: THRESHOLD CALCULATION")
             logger.info("=" * 50)
             threshold_stats = self.calculate_threshold(X_train)
+            self._flush_messages()
             
             # Step 4: Save everything
             logger.info("=" * 50)
             logger.info("STEP 4: SAVE MODEL AND METADATA")
             logger.info("=" * 50)
             self.save_model(final_sensor_columns, threshold_stats)
+            self._flush_messages()
+            self._release_model()
             
-            # Combine all results
-            final_result = {
-                **training_metrics,
-                **threshold_stats,
-                'sensor_columns': final_sensor_columns,
-                'model_type': 'simple_autoencoder'
-            }
+            # Combine all results; training_metrics is a fresh local dict, so extend it in place
+            final_result = training_metrics
+            final_result |= threshold_stats
+            final_result |= {'sensor_columns': final_sensor_columns, 'model_type': 'simple_autoencoder'}
             
-            end_time = pd.Timestamp.now()
-            total_duration = (end_time - start_time).total_seconds()
+            total_duration = time.monotonic() - start_time
             
             logger.info("=" * 50)
             logger.info("🎉 TRAINING PIPELINE COMPLETED SUCCESSFULLY")
             logger.info("=" * 50)
             logger.info(f"⏱️ Total training time: {total_duration:.2f} seconds")
-            logger.info(f"📊 Final model metrics:")
+            logger.info("📊 Final model metrics:")
             logger.info(f"   - Training loss: {final_result['final_loss']:.6f}")
             logger.info(f"   - Validation loss: {final_result['final_val_loss']:.6f}")
             logger.info(f"   - Anomaly threshold: {final_result['threshold']:.6f}")
@@ -765,10 +1323,8 @@ class UltraSimpleTrainer:
             return final_result
             
         except Exception as e:
+            # The traceback is logged once by main(), where the exception ends up
             logger.error(f"❌ Training pipeline failed: {e}")
-            logger.error(f"❌ Error details: {str(e)}")
-            import traceback
-            logger.error(f"❌ Traceback: {traceback.format_exc()}")
             self._send_detailed_message(f"Training pipeline failed: {str(e)}", "error")
             raise
     
@@ -777,10 +1333,9 @@ class UltraSimpleTrainer:
         try:
             config_path = os.path.join(os.path.dirname(__file__), 'pretrained_config.json')
             if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
+                config = dict(_read_pretrained_config(config_path))
                 logger.info(f"✅ Loaded pretrained config from {config_path}")
-                return config.get('pretrained_model', {})
+                return config
             else:
                 logger.warning(f"⚠️ Pretrained config not found at {config_path}")
                 return {}
@@ -788,7 +1343,7 @@ class UltraSimpleTrainer:
             logger.error(f"❌ Error loading pretrained config: {e}")
             return {}
     
-    def _load_pretrained_model(self, input_shape: int) -> Sequential:
+    def _load_pretrained_model(self, input_shape: int) -> 'Sequential':
         """Load pretrained model weights if available and compatible."""
         try:
             if not self.pretrained_config:
@@ -805,8 +1360,18 @@ class UltraSimpleTrainer:
             # Try to load the pretrained model
             pretrained_model_path = os.path.join(os.path.dirname(__file__), self.pretrained_config.get('model_path', ''))
             if os.path.exists(pretrained_model_path):
+                # Check the stored input width before paying for a full model load
+                stored_input_dim = _read_pretrained_input_dim(pretrained_model_path)
+                if stored_input_dim is not None and stored_input_dim != input_shape:
+                    logger.warning(f"⚠️ Pretrained model input shape mismatch: expected {input_shape}, got {stored_input_dim}")
+                    return None
+                
                 logger.info(f"🔄 Loading pretrained model from {pretrained_model_path}")
-                pretrained_model = tf.keras.models.load_model(pretrained_model_path)
+                tf = _import_tensorflow()
+                # Fine-tuning mutates the weights, so every trainer gets a fresh model
+                architecture, weights = _read_pretrained_model(pretrained_model_path)
+                pretrained_model = tf.keras.models.model_from_json(architecture)
+                pretrained_model.set_weights(weights)
                 
                 # Verify the model architecture is compatible
                 if pretrained_model.layers[0].input_shape[1] == input_shape:
@@ -823,7 +1388,7 @@ class UltraSimpleTrainer:
             logger.error(f"❌ Error loading pretrained model: {e}")
             return None
     
-    def _load_pretrained_scaler(self) -> StandardScaler:
+    def _load_pretrained_scaler(self) -> 'StandardScaler':
         """Load pretrained scaler if available."""
         try:
             if not self.pretrained_config:
@@ -832,8 +1397,8 @@ class UltraSimpleTrainer:
             pretrained_scaler_path = os.path.join(os.path.dirname(__file__), self.pretrained_config.get('scaler_path', ''))
             if os.path.exists(pretrained_scaler_path):
                 logger.info(f"🔄 Loading pretrained scaler from {pretrained_scaler_path}")
-                scaler = joblib.load(pretrained_scaler_path)
-                logger.info(f"✅ Pretrained scaler loaded successfully")
+                scaler = _read_pretrained_scaler(pretrained_scaler_path)
+                logger.info("✅ Pretrained scaler loaded successfully")
                 return scaler
             else:
                 logger.warning(f"⚠️ Pretrained scaler file not found at {pretrained_scaler_path}")
@@ -843,29 +1408,43 @@ class UltraSimpleTrainer:
             logger.error(f"❌ Error loading pretrained scaler: {e}")
             return None
 
+def _exit(code: int):
+    """Flush all output and exit immediately.
+    
+    os._exit skips interpreter teardown, where TensorFlow's atexit hooks can
+    hold the process (and the waiting Node parent) for seconds after the
+    result is already written. Nothing in this module registers atexit work.
+    """
+    logging.shutdown()
+    _stdout.close()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+
 def main():
     """Main function with comprehensive logging and error handling."""
-    start_time = pd.Timestamp.now()
+    start_time = time.monotonic()
     logger.info("=" * 60)
     logger.info("🚀 ULTRA-SIMPLE TRAINER STARTED")
     logger.info("=" * 60)
-    logger.info(f"⏰ Start time: {start_time}")
+    logger.info(f"⏰ Start time: {datetime.now()}")
     logger.info(f"📁 Working directory: {os.getcwd()}")
     logger.info(f"🐍 Python executable: {sys.executable}")
     
+    trainer = None
     try:
         # Parse command line arguments
         if len(sys.argv) != 4:
             logger.error(f"❌ Invalid number of arguments. Expected 3, got {len(sys.argv) - 1}")
-            logger.error(f"❌ Usage: python simple_trainer.py <user_id> <machine_id> <csv_path>")
+            logger.error("❌ Usage: python simple_trainer.py <user_id> <machine_id> <csv_path>")
             logger.error(f"❌ Arguments received: {sys.argv[1:]}")
-            sys.exit(1)
+            _exit(1)
         
         user_id = sys.argv[1]
         machine_id = sys.argv[2]
         csv_path = sys.argv[3]
         
-        logger.info(f"📋 Command line arguments:")
+        logger.info("📋 Command line arguments:")
         logger.info(f"   - User ID: {user_id}")
         logger.info(f"   - Machine ID: {machine_id}")
         logger.info(f"   - CSV path: {csv_path}")
@@ -873,11 +1452,11 @@ def main():
         # Validate inputs
         if not os.path.exists(csv_path):
             logger.error(f"❌ CSV file not found: {csv_path}")
-            sys.exit(1)
+            _exit(1)
         
         if not user_id or not machine_id:
-            logger.error(f"❌ Invalid user_id or machine_id")
-            sys.exit(1)
+            logger.error("❌ Invalid user_id or machine_id")
+            _exit(1)
         
         # Create trainer and run training
         logger.info("🏗️ Creating UltraSimpleTrainer instance...")
@@ -885,10 +1464,10 @@ def main():
         
         logger.info("🎯 Starting training process...")
         result = trainer.train(csv_path, [])  # Empty list for auto-detection
+        trainer.close()
         
         # Log final success
-        end_time = pd.Timestamp.now()
-        total_duration = (end_time - start_time).total_seconds()
+        total_duration = time.monotonic() - start_time
         
         logger.info("=" * 60)
         logger.info("✅ TRAINING COMPLETED SUCCESSFULLY")
@@ -900,29 +1479,30 @@ def main():
         success_data = {
             "type": "success",
             "stats": result,
-            "timestamp": pd.Timestamp.now().isoformat()
+            "timestamp": datetime.now().isoformat()
         }
-        print(f"SUCCESS:{json.dumps(success_data)}")
+        _stdout.write_json(b'SUCCESS', success_data, flush=True)
         
         logger.info("🎉 Exiting successfully")
-        sys.exit(0)
+        _exit(0)
         
     except Exception as e:
-        logger.error(f"❌ Fatal error in main function: {e}")
-        logger.error(f"❌ Error details: {str(e)}")
-        import traceback
-        logger.error(f"❌ Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Fatal error in main function: {e}")
+        
+        # Send buffered detailed messages before the final error
+        if trainer is not None:
+            trainer.close()
         
         # Send error message to Node.js
         error_data = {
             "type": "error",
             "message": str(e),
-            "timestamp": pd.Timestamp.now().isoformat()
+            "timestamp": datetime.now().isoformat()
         }
-        print(f"ERROR:{json.dumps(error_data)}")
+        _stdout.write_json(b'ERROR', error_data, flush=True)
         
         logger.error("💥 Exiting with error")
-        sys.exit(1)
+        _exit(1)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
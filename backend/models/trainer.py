@@ -7,6 +7,10 @@ This replaces the complex anomaly.py with a cleaner, more maintainable approach.
 import os
 import sys
 import json
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
 import tensorflow as tf
@@ -17,6 +21,16 @@ import joblib
 from typing import List, Dict, Tuple
 import logging
 
+# orjson serializes the progress stream in C; fall back to the stdlib encoder
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -28,6 +42,21 @@ BATCH_SIZE = 32
 VALIDATION_SPLIT = 0.2
 MAX_SAMPLES = 5000  # Limit data size for faster training
 
+# PyArrow's multithreaded CSV parser is used when installed
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+GPU_AVAILABLE = bool(tf.config.list_physical_devices('GPU'))
+
+# Train in float16 with float32 master weights on GPUs; CPUs have no fast
+# float16 LSTM kernels, so they stay in float32
+MIXED_PRECISION = GPU_AVAILABLE
+if MIXED_PRECISION:
+    tf.keras.mixed_precision.set_global_policy('mixed_float16')
+
 class SimpleTrainer:
     """Simple and reliable trainer for predictive maintenance models."""
     
@@ -38,6 +67,12 @@ class SimpleTrainer:
         self.scaler = None
         self.model = None
         
+        # Progress lines are written by a daemon thread so the training thread
+        # never blocks on the pipe to Node.js
+        self._io_queue = queue.SimpleQueue()
+        self._io_thread = threading.Thread(target=self._drain_io, name='trainer-io', daemon=True)
+        self._io_thread.start()
+        
     def _create_model_directory(self) -> str:
         """Create and return the model directory path."""
         base_dir = os.path.join(os.path.dirname(__file__), 'user_models')
@@ -55,41 +90,71 @@ class SimpleTrainer:
             "progress": progress,
             "message": message
         }
-        print(json.dumps(progress_data), flush=True)
+        self._emit(progress_data)
         logger.info(f"Progress {progress}%: {message}")
     
+    def _emit(self, data: Dict):
+        """Queue one JSON line for the writer thread."""
+        self._io_queue.put(_dumps(data) + b'\n')
+    
+    def _drain_io(self):
+        """Write queued lines to stdout, flushing once the queue runs dry."""
+        while True:
+            line = self._io_queue.get()
+            if line is None:
+                break
+            sys.stdout.buffer.write(line)
+            if self._io_queue.empty():
+                sys.stdout.buffer.flush()
+        sys.stdout.buffer.flush()
+    
+    def close(self):
+        """Write out any queued lines and stop the writer thread."""
+        self._io_queue.put(None)
+        self._io_thread.join()
+    
     def load_and_preprocess_data(self, csv_path: str, sensor_columns: List[str]) -> Tuple[np.ndarray, List[str]]:
         """Load and preprocess CSV data."""
         self._send_progress(10, "Loading training data...")
         
         try:
-            # Read CSV file
-            df = pd.read_csv(csv_path)
-            logger.info(f"Loaded CSV with {len(df)} rows and {len(df.columns)} columns")
-            
-            # Find available sensor columns
-            available_columns = [col for col in sensor_columns if col in df.columns]
+            # Read just the header to find available sensor columns
+            csv_columns = pd.read_csv(csv_path, nrows=0).columns
+            available_columns = [col for col in sensor_columns if col in csv_columns]
             if not available_columns:
-                raise ValueError(f"No sensor columns found in CSV. Available: {list(df.columns)}")
+                raise ValueError(f"No sensor columns found in CSV. Available: {list(csv_columns)}")
             
             logger.info(f"Using sensor columns: {available_columns}")
             
-            # Select only the sensor columns
-            df_sensors = df[available_columns].copy()
+            # Parse only the sensor columns, straight to float32
+            df = pd.read_csv(
+                csv_path,
+                usecols=available_columns,
+                dtype={col: np.float32 for col in available_columns},
+                engine=CSV_ENGINE
+            )
+            logger.info(f"Loaded CSV with {len(df)} rows and {len(csv_columns)} columns")
+            
+            # Select the sensor columns as one float32 array (read_csv keeps file order)
+            sensor_data = df[available_columns].to_numpy(dtype=np.float32)
+            del df
             
             # Handle missing values
-            df_sensors = df_sensors.dropna()
-            if df_sensors.empty:
+            complete_rows = ~np.isnan(sensor_data).any(axis=1)
+            if not complete_rows.all():
+                sensor_data = sensor_data[complete_rows]
+            if len(sensor_data) == 0:
                 raise ValueError("No data remaining after removing missing values")
             
-            # Limit data size for faster training
-            if len(df_sensors) > MAX_SAMPLES:
-                df_sensors = df_sensors.sample(n=MAX_SAMPLES, random_state=42)
+            # Limit data size for faster training; an even stride keeps rows in
+            # time order so the sliding windows still see consecutive readings
+            if len(sensor_data) > MAX_SAMPLES:
+                idx = np.linspace(0, len(sensor_data) - 1, MAX_SAMPLES).astype(np.intp)
+                sensor_data = sensor_data[idx]
                 logger.info(f"Sampled {MAX_SAMPLES} rows for faster training")
             
-            # Scale the data
-            self.scaler = StandardScaler()
-            scaled_data = self.scaler.fit_transform(df_sensors)
+            # Scale the data in float32, in place
+            scaled_data = self._fit_scaler(sensor_data, available_columns)
             
             self._send_progress(30, f"Preprocessed {len(scaled_data)} samples")
             return scaled_data, available_columns
@@ -98,15 +163,34 @@ class SimpleTrainer:
             logger.error(f"Error loading data: {str(e)}")
             raise
     
+    def _fit_scaler(self, data: np.ndarray, columns: List[str]) -> np.ndarray:
+        """Standardize a float32 array in place and keep the fit as a StandardScaler."""
+        mean = data.mean(axis=0, dtype=np.float32)
+        var = data.var(axis=0, dtype=np.float32)
+        scale = np.sqrt(var)
+        scale[scale == 0] = 1.0
+        
+        # A regular fitted StandardScaler keeps scaler.pkl loadable by the predictors
+        self.scaler = StandardScaler()
+        self.scaler.mean_ = mean.astype(np.float64)
+        self.scaler.var_ = var.astype(np.float64)
+        self.scaler.scale_ = scale.astype(np.float64)
+        self.scaler.n_samples_seen_ = data.shape[0]
+        self.scaler.n_features_in_ = data.shape[1]
+        self.scaler.feature_names_in_ = np.asarray(columns, dtype=object)
+        
+        np.subtract(data, mean, out=data)
+        np.multiply(data, np.reciprocal(scale), out=data)
+        return data
+    
     def create_sequences(self, data: np.ndarray) -> np.ndarray:
         """Create time series sequences for LSTM training."""
         self._send_progress(40, "Creating training sequences...")
         
-        sequences = []
-        for i in range(len(data) - SEQUENCE_LENGTH + 1):
-            sequences.append(data[i:i + SEQUENCE_LENGTH])
-        
-        sequences = np.array(sequences)
+        # Zero-copy view of overlapping windows: (n_windows, SEQUENCE_LENGTH, n_features)
+        sequences = np.lib.stride_tricks.sliding_window_view(
+            data, window_shape=SEQUENCE_LENGTH, axis=0
+        ).transpose(0, 2, 1)
         logger.info(f"Created {len(sequences)} sequences with shape {sequences.shape}")
         return sequences
     
@@ -114,22 +198,24 @@ class SimpleTrainer:
         """Build a simple LSTM autoencoder model."""
         self._send_progress(50, "Building neural network model...")
         
+        # tanh/sigmoid LSTMs without recurrent dropout run on the fused cuDNN kernel
         # Encoder
         encoder = Sequential([
-            LSTM(64, activation='relu', input_shape=input_shape, return_sequences=True),
+            LSTM(64, activation='tanh', recurrent_activation='sigmoid', input_shape=input_shape, return_sequences=True),
             Dropout(0.2),
-            LSTM(32, activation='relu', return_sequences=False),
+            LSTM(32, activation='tanh', recurrent_activation='sigmoid', return_sequences=False),
             Dropout(0.2)
         ])
         
         # Decoder
         decoder = Sequential([
             RepeatVector(input_shape[0]),  # Repeat the encoded vector
-            LSTM(32, activation='relu', return_sequences=True),
+            LSTM(32, activation='tanh', recurrent_activation='sigmoid', return_sequences=True),
             Dropout(0.2),
-            LSTM(64, activation='relu', return_sequences=True),
+            LSTM(64, activation='tanh', recurrent_activation='sigmoid', return_sequences=True),
             Dropout(0.2),
-            TimeDistributed(Dense(input_shape[1], activation='linear'))
+            # Keep the reconstruction in float32 so the MSE loss is numerically stable
+            TimeDistributed(Dense(input_shape[1], activation='linear', dtype='float32'), dtype='float32')
         ])
         
         # Combine encoder and decoder
@@ -138,28 +224,41 @@ class SimpleTrainer:
             decoder
         ])
         
+        optimizer = tf.keras.optimizers.Adam()
+        if MIXED_PRECISION:
+            # Dynamic loss scaling keeps small float16 gradients from underflowing
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+        
         model.compile(
-            optimizer='adam',
+            optimizer=optimizer,
             loss='mse',
-            metrics=['mae']
+            metrics=['mae'],
+            # XLA fuses the LSTM gates, dropout and Dense epilogue on CPU; on GPU the
+            # cuDNN LSTM kernel is already fused and XLA cannot compile it
+            jit_compile=not GPU_AVAILABLE
         )
         
         logger.info(f"Built autoencoder with {model.count_params()} parameters")
         return model
     
-    def train_model(self, X_train: np.ndarray) -> Dict:
-        """Train the model and return training metrics."""
+    def train_model(self, data: np.ndarray) -> Dict:
+        """Train the model on windows of the scaled data and return training metrics."""
         self._send_progress(60, "Training neural network...")
         
         # Build model
-        self.model = self.build_model((X_train.shape[1], X_train.shape[2]))
+        self.model = self.build_model((SEQUENCE_LENGTH, data.shape[1]))
+        
+        # Hold out the last windows for validation, as validation_split did
+        n_sequences = len(data) - SEQUENCE_LENGTH + 1
+        split_at = int(np.ceil(n_sequences * (1 - VALIDATION_SPLIT)))
+        train_ds = self._make_dataset(data[:split_at + SEQUENCE_LENGTH - 1], shuffle=True)
+        val_ds = self._make_dataset(data[split_at:])
         
         # Train model
         history = self.model.fit(
-            X_train, X_train,  # Autoencoder: input = target
+            train_ds,
             epochs=EPOCHS,
-            batch_size=BATCH_SIZE,
-            validation_split=VALIDATION_SPLIT,
+            validation_data=val_ds,
             verbose=0,
             callbacks=[
                 self._create_progress_callback()
@@ -174,12 +273,26 @@ class SimpleTrainer:
             'final_loss': train_loss,
             'final_val_loss': val_loss,
             'epochs_trained': len(history.history['loss']),
-            'training_samples': len(X_train)
+            'training_samples': n_sequences
         }
         
         self._send_progress(80, f"Training completed. Final loss: {train_loss:.4f}")
         return metrics
     
+    def _make_dataset(self, data: np.ndarray, shuffle: bool = False, batch_size: int = BATCH_SIZE) -> tf.data.Dataset:
+        """Slice (input, target) windows out of the scaled rows inside the input pipeline."""
+        dataset = tf.keras.utils.timeseries_dataset_from_array(
+            data,
+            None,
+            sequence_length=SEQUENCE_LENGTH,
+            batch_size=None
+        )
+        if shuffle:
+            # Reshuffled every epoch, like fit(shuffle=True) on arrays
+            dataset = dataset.shuffle(len(data), seed=42)
+        # Autoencoder: input = target
+        return dataset.batch(batch_size).map(lambda x: (x, x)).prefetch(tf.data.AUTOTUNE)
+    
     def _create_progress_callback(self):
         """Create a callback to report training progress."""
         class ProgressCallback(tf.keras.callbacks.Callback):
@@ -187,9 +300,15 @@ class SimpleTrainer:
                 super().__init__()
                 self.trainer = trainer
                 self.epoch_count = 0
+                self.last_sent = 0.0
             
             def on_epoch_end(self, epoch, logs=None):
                 self.epoch_count += 1
+                # Report at most twice a second, but always report the last epoch
+                now = time.monotonic()
+                if now - self.last_sent < 0.5 and self.epoch_count < EPOCHS:
+                    return
+                self.last_sent = now
                 progress = 60 + (self.epoch_count / EPOCHS) * 20  # 60-80%
                 loss = logs.get('loss', 0)
                 self.trainer._send_progress(
@@ -199,16 +318,25 @@ class SimpleTrainer:
         
         return ProgressCallback(self)
     
-    def calculate_threshold(self, X_train: np.ndarray) -> float:
-        """Calculate anomaly threshold based on reconstruction error."""
+    def calculate_threshold(self, data: np.ndarray, X_train: np.ndarray) -> float:
+        """Calculate anomaly threshold based on reconstruction error.
+        
+        ``X_train`` is the window view of ``data`` from create_sequences; the model
+        reads the windows from the same float32 rows through the input pipeline.
+        """
         self._send_progress(85, "Calculating anomaly threshold...")
         
         # Get reconstruction errors
-        predictions = self.model.predict(X_train, verbose=0)
-        mse_errors = np.mean((X_train - predictions) ** 2, axis=(1, 2))
+        # Inference has no backward pass, so a large batch amortizes per-step overhead,
+        # and the pipeline gathers windows per batch rather than copying the view
+        predictions = self.model.predict(self._make_dataset(data, batch_size=1024), verbose=0)
+        # Reuse the prediction buffer for the residual and reduce it in one pass,
+        # avoiding a second (N, L, F) temporary
+        np.subtract(X_train, predictions, out=predictions)
+        mse_errors = np.einsum('ijk,ijk->i', predictions, predictions) / (X_train.shape[1] * X_train.shape[2])
         
-        # Calculate threshold as 95th percentile of errors
-        threshold = np.percentile(mse_errors, 95)
+        # Calculate threshold as 95th percentile of errors; one call partitions once for all three
+        percentile_90, threshold, percentile_99 = np.percentile(mse_errors, [90, 95, 99])
         
         # Calculate additional statistics
         stats = {
@@ -217,9 +345,9 @@ class SimpleTrainer:
             'std_error': float(np.std(mse_errors)),
             'min_error': float(np.min(mse_errors)),
             'max_error': float(np.max(mse_errors)),
-            'percentile_90': float(np.percentile(mse_errors, 90)),
+            'percentile_90': float(percentile_90),
             'percentile_95': float(threshold),
-            'percentile_99': float(np.percentile(mse_errors, 99))
+            'percentile_99': float(percentile_99)
         }
         
         logger.info(f"Calculated threshold: {threshold:.6f}")
@@ -229,10 +357,37 @@ class SimpleTrainer:
         """Save the trained model and metadata."""
         self._send_progress(90, "Saving model and metadata...")
         
-        # Save model
-        model_path = os.path.join(self.model_dir, 'model.h5')
-        self.model.save(model_path)
+        # The metadata files are small and independent of the model, so write them
+        # on a worker thread while the HDF5 save and TFLite conversion run
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            metadata = executor.submit(self._save_metadata, sensor_columns, training_stats)
+            
+            # Save model; predictors only run inference, so skip the optimizer state
+            model_path = os.path.join(self.model_dir, 'model.h5')
+            self.model.save(model_path, include_optimizer=False)
+            
+            # Export a TFLite copy for the predictor's CPU inference path
+            self._export_tflite(os.path.join(self.model_dir, 'model.tflite'))
+            
+            # Re-raise any failure from the metadata writes
+            metadata.result()
+        
+        # Bundle what the predictor needs into one file for a faster cold start.
+        # Written after model.h5 so the predictor's freshness check accepts it
+        meta_path = os.path.join(self.model_dir, 'meta.npz')
+        np.savez(
+            meta_path,
+            mean=self.scaler.mean_,
+            scale=self.scaler.scale_,
+            columns=np.array(sensor_columns),
+            threshold=training_stats['threshold']
+        )
         
+        logger.info(f"Model saved to {self.model_dir}")
+        self._send_progress(100, "Training completed successfully!")
+    
+    def _save_metadata(self, sensor_columns: List[str], training_stats: Dict):
+        """Save the scaler, column list and training statistics."""
         # Save scaler
         scaler_path = os.path.join(self.model_dir, 'scaler.pkl')
         joblib.dump(self.scaler, scaler_path)
@@ -246,9 +401,19 @@ class SimpleTrainer:
         stats_path = os.path.join(self.model_dir, 'training_stats.json')
         with open(stats_path, 'w') as f:
             json.dump(training_stats, f)
-        
-        logger.info(f"Model saved to {self.model_dir}")
-        self._send_progress(100, "Training completed successfully!")
+    
+    def _export_tflite(self, tflite_path: str):
+        """Export the model to TFLite; the predictor falls back to model.h5 if this fails."""
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+            with open(tflite_path, 'wb') as f:
+                f.write(converter.convert())
+            logger.info(f"Exported TFLite model to {tflite_path}")
+        except Exception as e:
+            logger.warning(f"TFLite export failed, predictor will use the Keras model: {str(e)}")
+            # Never leave a stale export from a previous training behind
+            if os.path.exists(tflite_path):
+                os.remove(tflite_path)
     
     def train(self, csv_path: str, sensor_columns: List[str]) -> Dict:
         """Complete training pipeline."""
@@ -259,11 +424,11 @@ class SimpleTrainer:
             # Create sequences
             sequences = self.create_sequences(scaled_data)
             
-            # Train model
-            training_metrics = self.train_model(sequences)
+            # Train model; windows are cut from the scaled rows by the input pipeline
+            training_metrics = self.train_model(scaled_data)
             
             # Calculate threshold
-            threshold_stats = self.calculate_threshold(sequences)
+            threshold_stats = self.calculate_threshold(scaled_data, sequences)
             
             # Combine all statistics
             final_stats = {
@@ -285,7 +450,7 @@ class SimpleTrainer:
                 "type": "error",
                 "message": str(e)
             }
-            print(json.dumps(error_data), flush=True)
+            self._emit(error_data)
             raise
 
 def main():
@@ -301,6 +466,7 @@ def main():
     machine_id = sys.argv[2]
     csv_path = sys.argv[3]
     
+    trainer = None
     try:
         # Load sensor columns from environment or use defaults
         sensor_columns_str = os.environ.get('SENSOR_COLUMNS', '')
@@ -308,7 +474,7 @@ def main():
             sensor_columns = json.loads(sensor_columns_str)
         else:
             # Try to infer columns from CSV
-            df = pd.read_csv(csv_path, nrows=1)
+            df = pd.read_csv(csv_path, nrows=0)
             sensor_columns = [col for col in df.columns if col.lower() not in ['timestamp', 'time', 'date', 'id']]
         
         logger.info(f"Starting training for user {user_id}, machine {machine_id}")
@@ -317,6 +483,7 @@ def main():
         # Create trainer and start training
         trainer = SimpleTrainer(user_id, machine_id)
         stats = trainer.train(csv_path, sensor_columns)
+        trainer.close()
         
         # Send final success message
         success_data = {
@@ -327,6 +494,9 @@ def main():
         
     except Exception as e:
         logger.error(f"Training failed: {str(e)}")
+        # Let queued progress lines out before the final error
+        if trainer is not None:
+            trainer.close()
         error_data = {
             "type": "error",
             "message": str(e)
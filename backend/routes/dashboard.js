@@ -1099,13 +1099,13 @@ async function startUltraSimpleTraining(machine, user, csvFilePath) {
                         user_id: machine.userId.toString(),
                         machine_id: machineId,
                         model_version: '1.0',
-                        training_algorithm: 'simple_autoencoder',
+                        training_algorithm: trainingResult.training_algorithm || 'simple_autoencoder',
                         data_preprocessing: {
                             scaling_method: 'StandardScaler',
                             missing_value_handling: 'forward_fill_backward_fill',
                             outlier_handling: 'percentile_based_threshold'
                         },
-                        model_architecture: {
+                        model_architecture: trainingResult.model_architecture || {
                             type: 'autoencoder',
                             layers: ['dense_16', 'dense_8', 'dense_4', 'dense_8', 'dense_16', 'dense_output'],
                             activation: 'relu',
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Checks that SimplePredictor.predict_csv streams a CSV to the same results as
+predict() on the whole file, including the missing-value fill.
+"""
+
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'models'))
+try:
+    from predictor import SimplePredictor, Scaler, SEQUENCE_LENGTH
+except ImportError as e:
+    pytest.skip(f"predictor dependencies unavailable: {e}", allow_module_level=True)
+
+
+class AffineModel:
+    """Deterministic stand-in for the Keras model."""
+
+    def predict(self, sequences, verbose=0):
+        return sequences * 0.5 + 0.1
+
+
+def make_predictor():
+    predictor = SimplePredictor('test_user', 'test_machine')
+    predictor.model = AffineModel()
+    predictor.sensor_columns = ('a', 'b')
+    predictor.scaler = Scaler(np.array([0.5, 1.0], dtype=np.float32), np.array([2.0, 0.5], dtype=np.float32))
+    predictor._scale_a = np.reciprocal(predictor.scaler.scale)
+    predictor._scale_b = -predictor.scaler.mean * predictor._scale_a
+    predictor.threshold = 1.0
+    return predictor
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    n_rows = 47  # Not a multiple of any chunk size below
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=n_rows)
+    b = rng.normal(size=n_rows)
+    a[:3] = np.nan          # Leading gap
+    a[20:23] = np.nan       # Interior gap
+    b[:25] = np.nan         # All-NaN for the first chunks
+    b[-2:] = np.nan         # Trailing gap
+    df = pd.DataFrame({
+        'timestamp': np.arange(n_rows),
+        'a': a,
+        'b': b,
+        'notes': np.nan,    # Non-sensor column that is empty throughout
+    })
+    path = tmp_path / 'readings.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize('chunksize', [SEQUENCE_LENGTH, 13, 1000])
+def test_predict_csv_matches_whole_file(csv_path, chunksize):
+    predictor = make_predictor()
+    expected = predictor.predict(pd.read_csv(csv_path))
+    streamed = predictor.predict_csv(csv_path, chunksize=chunksize)
+
+    assert not np.isnan(streamed['errors']).any()
+    np.testing.assert_allclose(streamed['predictions'], expected['predictions'], rtol=1e-6)
+    np.testing.assert_allclose(streamed['errors'], expected['errors'], rtol=1e-6)
+    assert streamed['num_anomalies'] == expected['num_anomalies']
+    assert streamed['total_predictions'] == expected['total_predictions']
+
+
+def test_filled_chunks_match_ffill_bfill():
+    df = pd.DataFrame({
+        'a': [np.nan, np.nan, 1.0, np.nan, 2.0, 3.0, np.nan],   # Leading and interior gaps
+        'b': [4.0, 5.0, np.nan, 6.0, 7.0, np.nan, np.nan],      # Trailing gap
+        'c': np.nan,                                            # Never valid
+    })
+    first_valid = df.bfill().iloc[0]
+    chunks = (df.iloc[start:start + 3] for start in range(0, len(df), 3))
+
+    filled = pd.concat(make_predictor()._filled_chunks(chunks, first_valid))
+    np.testing.assert_array_equal(filled.to_numpy(), df.ffill().bfill().to_numpy())
+
+
+def test_predict_csv_rejects_chunks_shorter_than_a_sequence(csv_path):
+    with pytest.raises(ValueError):
+        make_predictor().predict_csv(csv_path, chunksize=SEQUENCE_LENGTH - 1)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Checks the hand-rolled NumPy helpers in simple_trainer.py against the library
+functions they replace.
+"""
+
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'models'))
+
+
+@pytest.fixture(scope='module')
+def trainer_class(tmp_path_factory):
+    # The module opens training.log in the working directory on import
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('logs'))
+    try:
+        from simple_trainer import UltraSimpleTrainer
+    finally:
+        os.chdir(cwd)
+    return UltraSimpleTrainer
+
+
+@pytest.mark.parametrize('n', [1, 2, 7, 500])
+def test_quantiles_match_percentile(trainer_class, n):
+    values = np.random.default_rng(n).exponential(size=n)
+    qs = [0.0, 0.25, 0.5, 0.9, 0.95, 0.99, 1.0]
+    np.testing.assert_allclose(
+        trainer_class._quantiles(values, qs),
+        np.percentile(values, [q * 100 for q in qs]),
+        rtol=1e-12
+    )
+
+
+def test_fill_missing_matches_ffill_bfill(trainer_class):
+    pd = pytest.importorskip('pandas')
+    data = np.random.default_rng(0).normal(size=(12, 4)).astype(np.float32)
+    data[:3, 0] = np.nan    # Leading gap
+    data[-2:, 1] = np.nan   # Trailing gap
+    data[4:7, 2] = np.nan   # Interior gap
+    data[0, 2] = np.nan
+    data[:, 3] = np.nan     # Never valid
+    expected = pd.DataFrame(data).ffill().bfill().to_numpy()
+
+    filled = trainer_class._fill_missing(data.copy(), np.isnan(data))
+    np.testing.assert_array_equal(filled, expected)
+
+
+def test_forward_pass_matches_model(trainer_class):
+    pytest.importorskip('tensorflow')
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense
+
+    model = Sequential([
+        Dense(8, activation='relu', input_shape=(5,)),
+        Dense(3, activation='relu'),
+        Dense(5, activation='linear')
+    ])
+    trainer = trainer_class.__new__(trainer_class)
+    trainer.model = model
+    X = np.random.default_rng(0).normal(size=(64, 5)).astype(np.float32)
+
+    np.testing.assert_allclose(
+        trainer._forward_pass(X),
+        np.asarray(model(X, training=False)),
+        rtol=1e-5, atol=1e-6
+    )